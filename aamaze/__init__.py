@@ -2,5 +2,6 @@ from os import environ
 
 from .base_maze import GenerationAlgorithm, Maze, MazeNode, SolvingAlgorithm
 from .graphics import GraphicsApp
+from .maze_tree import MazeTree
 
 environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
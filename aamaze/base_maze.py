@@ -1,19 +1,134 @@
 from __future__ import annotations
 
+import mmap
+import random
 from abc import ABC, abstractmethod
-from typing import Dict, List, Union
+from array import array
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple, Union
+
+from aamaze.maze_file import (FLAG_PACKED, FLAG_START_FILLED,
+                              MAZE_FILE_HEADER, decode_header, encode_header,
+                              pack_walls, unpack_walls)
+from aamaze.maze_hash import get_layout_key, get_walls_key, hash_wall_grid
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 TOP_WALL = 0b00001000
 BOTTOM_WALL = 0b00000100
 LEFT_WALL = 0b00000010
 RIGHT_WALL = 0b00000001
 
+# Same order as the tables returned by get_neighbour_tables.
+DIRECTIONS = (TOP_WALL, BOTTOM_WALL, LEFT_WALL, RIGHT_WALL)
+# Position of each direction in DIRECTIONS (and so of its table in neighbour_tables).
+DIRECTION_POSITIONS = {direction: position for position, direction in enumerate(DIRECTIONS)}
+
+OPPOSITE_WALLS = {TOP_WALL: BOTTOM_WALL, BOTTOM_WALL: TOP_WALL, LEFT_WALL: RIGHT_WALL, RIGHT_WALL: LEFT_WALL}
+
+# Distance used by solvers for nodes that have not been reached.
+UNREACHED = 2 ** 31 - 1
+
+# Number of distance fields (one per source node) each Maze keeps cached.
+DISTANCE_FIELD_CACHE_SIZE = 8
+
+# Number of open sides for every possible walls value.
+OPENING_COUNTS = [4 - bin(walls & 0b00001111).count("1") for walls in range(256)]
+if np is not None: OPENING_COUNTS = np.array(OPENING_COUNTS, dtype=np.uint8)
+
+
+def get_random_generator(seed: Any = None) -> random.Random:
+    # A random.Random is used as given (so it can be shared). A NumPy Generator seeds a new random.Random from one
+    # draw. Anything else (None, an int, str or bytes) seeds a new random.Random, where None means a random seed.
+    if isinstance(seed, random.Random): return seed
+    if np is not None and isinstance(seed, np.random.Generator):
+        return random.Random(int(seed.integers(0, 2 ** 63, dtype=np.int64)))
+    return random.Random(seed)
+
+
+def require_numpy():
+    if np is None: raise ImportError("numpy is required for this operation (pip install numpy).")
+
+
+def _set_border_walls(wall_grid: bytearray, width: int, height: int):
+    if np is not None:
+        grid = np.frombuffer(wall_grid, dtype=np.uint8).reshape(height, width)
+        grid[0, :] |= BOTTOM_WALL
+        grid[-1, :] |= TOP_WALL
+        grid[:, 0] |= LEFT_WALL
+        grid[:, -1] |= RIGHT_WALL
+        return
+
+    for i in range(0, width): wall_grid[i] |= BOTTOM_WALL
+    for i in range((height - 1) * width, width * height): wall_grid[i] |= TOP_WALL
+    for i in range(0, width * height, width): wall_grid[i] |= LEFT_WALL
+    for i in range(width - 1, height * width, width): wall_grid[i] |= RIGHT_WALL
+
+
+def get_neighbour_tables(width: int, height: int) -> Tuple[array, array, array, array]:
+    # Index of the neighbour above, below, left and right of every node (-1 if out of bounds).
+    size = width * height
+    border_row = array("i", [-1]) * width
+
+    above = array("i", range(width, size)) + border_row
+    below = border_row + array("i", range(0, size - width))
+    left = array("i")
+    right = array("i")
+    for row_start in range(0, size, width):
+        left.append(-1)
+        left.extend(range(row_start, row_start + width - 1))
+        right.extend(range(row_start + 1, row_start + width))
+        right.append(-1)
+
+    return above, below, left, right
+
+
+class ComputedNeighbourTable:
+    # Drop-in replacement for one of the get_neighbour_tables arrays that works out each neighbour on lookup.
+    # Used for memory-mapped mazes, where four int arrays per node would not fit in memory.
+    __slots__ = ("_direction", "_width", "_size")
+
+    def __init__(self, direction: int, width: int, height: int) -> None:
+        self._direction = direction
+        self._width = width
+        self._size = width * height
+
+    def __getitem__(self, index: int) -> int:
+        if self._direction == TOP_WALL:
+            return index + self._width if index + self._width < self._size else -1
+        if self._direction == BOTTOM_WALL:
+            return index - self._width if index >= self._width else -1
+        if self._direction == LEFT_WALL:
+            return index - 1 if index % self._width else -1
+        return index + 1 if (index + 1) % self._width else -1
+
+    def __len__(self) -> int:
+        return self._size
+
 
 class MazeNode:
-    def __init__(self, x: int, y: int, walls: int) -> None:
+    # MazeNodes are lightweight views onto a Maze's wall_grid, created on demand.
+    # A MazeNode created directly (without a maze) stores its own walls value.
+    __slots__ = ("x", "y", "_maze", "_index", "_walls")
+
+    def __init__(self, x: int, y: int, walls: int, maze: Maze = None) -> None:
         self.x = x
         self.y = y
-        self.walls = walls      #0b00001111 == top, bottom, left and right walls
+        self._maze = maze
+        self._index = x + (y * maze.w) if maze is not None else -1
+        self._walls = walls      #0b00001111 == top, bottom, left and right walls
+
+    @property
+    def walls(self) -> int:
+        if self._maze is None: return self._walls
+        return self._maze.wall_grid[self._index]
+
+    @walls.setter
+    def walls(self, value: int):
+        if self._maze is None: self._walls = value
+        else: self._maze.set_walls(self._index, value)
     
     def get_current_walls(self) -> Dict[str, bool]:
         return {
@@ -22,6 +137,15 @@ class MazeNode:
         "left": bool(self.walls & LEFT_WALL),
         "right": bool(self.walls & RIGHT_WALL)
         }
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, MazeNode): return NotImplemented
+        if self._maze is None or other._maze is None: return self is other
+        return self._maze is other._maze and self._index == other._index
+
+    def __hash__(self) -> int:
+        if self._maze is None: return id(self)
+        return hash((id(self._maze), self._index))
     
     def __repr__(self) -> str:
         return f"MazeNode(x={self.x}, y={self.y}, walls={self.walls})"
@@ -29,8 +153,10 @@ class MazeNode:
 
 
 class GenerationAlgorithm(ABC):
-    def __init__(self, maze: Maze) -> None:
+    def __init__(self, maze: Maze, seed: Any = None) -> None:
         self.maze = maze
+        # All of a generator's random choices come from here, so the same seed always makes the same maze.
+        self.random: random.Random = get_random_generator(seed)
 
     @abstractmethod
     def generate_maze(self) -> Maze:
@@ -43,10 +169,11 @@ class GenerationAlgorithm(ABC):
 
     @classmethod
     def try_create_outside_opening(cls, maze: Maze, node: MazeNode):
-        if node.x == 0: node.walls &= 0b1101
-        elif node.x == maze.w - 1: node.walls &= 0b1110
-        elif node.y == 0: node.walls &= 0b1011
-        elif node.y == maze.h - 1: node.walls &= 0b0111
+        node_index = maze.get_node_index(node)
+        if node.x == 0: maze.carve(node_index, LEFT_WALL)
+        elif node.x == maze.w - 1: maze.carve(node_index, RIGHT_WALL)
+        elif node.y == 0: maze.carve(node_index, BOTTOM_WALL)
+        elif node.y == maze.h - 1: maze.carve(node_index, TOP_WALL)
 
         # If Node is not on the edge of the maze, do nothing.
 
@@ -54,46 +181,37 @@ class GenerationAlgorithm(ABC):
 
     @staticmethod
     def add_walls(current_node: MazeNode, neighbour_node: MazeNode):
-        if neighbour_node.x == current_node.x + 1 and neighbour_node.y == current_node.y:
-            neighbour_node.walls |= 0b00000010
-            current_node.walls |= 0b00000001
-            return
-        
-        if neighbour_node.x == current_node.x - 1 and neighbour_node.y == current_node.y:
-            neighbour_node.walls |= 0b00000001
-            current_node.walls |= 0b00000010
-            return
-        
-        if neighbour_node.y == current_node.y + 1 and neighbour_node.x == current_node.x:
-            neighbour_node.walls |= 0b00000100
-            current_node.walls |= 0b00001000
-            return
-        if neighbour_node.y == current_node.y - 1 and neighbour_node.x == current_node.x:
-            neighbour_node.walls |= 0b00001000
-            current_node.walls |= 0b00000100
+        # Builds the wall between two neighbouring nodes (nothing happens if they are not neighbours).
+        maze = current_node._maze
+        if maze is None or neighbour_node._maze is not maze:
+            direction = GenerationAlgorithm._get_node_direction(current_node, neighbour_node)
+            if direction == 0: return
+            current_node.walls |= direction
+            neighbour_node.walls |= OPPOSITE_WALLS[direction]
             return
 
+        direction = maze.get_direction(current_node._index, neighbour_node._index)
+        if direction: maze.build(current_node._index, direction)
+
     @staticmethod
     def remove_walls(current_node: MazeNode, neighbour_node: MazeNode):
-        if neighbour_node.x == current_node.x + 1 and neighbour_node.y == current_node.y:
-            neighbour_node.walls &= 0b00001101
-            current_node.walls &= 0b00001110
-            return
-        
-        if neighbour_node.x == current_node.x - 1 and neighbour_node.y == current_node.y:
-            neighbour_node.walls &= 0b00001110
-            current_node.walls &= 0b00001101
-            return
-        
-        if neighbour_node.y == current_node.y + 1 and neighbour_node.x == current_node.x:
-            neighbour_node.walls &= 0b00001011
-            current_node.walls &= 0b00000111
-            return
-        if neighbour_node.y == current_node.y - 1 and neighbour_node.x == current_node.x:
-            neighbour_node.walls &= 0b00000111
-            current_node.walls &= 0b00001011
+        maze = current_node._maze
+        if maze is None or neighbour_node._maze is not maze:
+            direction = GenerationAlgorithm._get_node_direction(current_node, neighbour_node)
+            if direction == 0: return
+            current_node.walls &= ~direction
+            neighbour_node.walls &= ~OPPOSITE_WALLS[direction]
             return
 
+        direction = maze.get_direction(current_node._index, neighbour_node._index)
+        if direction: maze.carve(current_node._index, direction)
+
+    @staticmethod
+    def _get_node_direction(current_node: MazeNode, neighbour_node: MazeNode) -> int:
+        # get_direction for nodes that don't belong to the same maze.
+        offset = (neighbour_node.x - current_node.x, neighbour_node.y - current_node.y)
+        return {(0, 1): TOP_WALL, (0, -1): BOTTOM_WALL, (-1, 0): LEFT_WALL, (1, 0): RIGHT_WALL}.get(offset, 0)
+
 
 
 class SolvingAlgorithm(ABC):
@@ -128,12 +246,33 @@ class SolvingAlgorithm(ABC):
 
 class Maze():
 
-    def __init__(self, w: int, h: int, start_filled: bool = True, entrance_index: int = 0, exit_index: int = -1) -> None:
+    def __init__(self, w: int, h: int, start_filled: bool = True, entrance_index: int = 0, exit_index: int = -1,
+                  wall_grid: bytearray = None) -> None:
         # (0, 0) is the bottom left of any maze.
         self.w = w
         self.h = h
         self.start_filled = start_filled
-        self.maze_body: List[MazeNode] = self.generate_blank_maze(self.w, self.h, start_filled)
+        # One byte of wall bits per node, indexed by x + (y * w).
+        if wall_grid is None: wall_grid = self.generate_blank_maze(self.w, self.h, start_filled)
+        elif len(wall_grid) != w * h: raise ValueError(f"wall_grid has {len(wall_grid)} nodes, expected {w * h}.")
+        self.wall_grid: bytearray = wall_grid
+        self.maze_body: MazeBody = MazeBody(self)
+        # Incremented by every wall edit made through the Maze (or MazeNode) API, so anything derived from the
+        # walls can tell when it is out of date. After writing to wall_grid (or wall_array) directly, call
+        # mark_walls_changed.
+        self.wall_version = 0
+        # Called with the indexes of the nodes whose walls changed, after every wall edit made through the API.
+        self._wall_listeners: List[Callable[[Sequence[int]], None]] = []
+        # XOR of the keys of every wall bit that is set (see maze_hash). None until fingerprint is first called.
+        self._wall_hash: int = None
+
+        # Cached distance fields by source index, valid while wall_version == _distance_fields_version.
+        self._distance_fields: Dict[int, array] = {}
+        self._distance_fields_version = 0
+
+        self._mmap: mmap.mmap = None
+        # Built on first use of neighbour_tables and kept with the maze (16 bytes per node), so they are freed with it.
+        self._neighbour_tables: Tuple[array, array, array, array] = None
 
         self._index = 0
 
@@ -144,6 +283,175 @@ class Maze():
     def size(self) -> int:
         return self.w * self.h
 
+    @property
+    def wall_array(self) -> np.ndarray:
+        # (h, w) uint8 array that shares memory with wall_grid (wall_array[y, x] == maze[x + (y * w)].walls).
+        # Call mark_walls_changed after editing walls through it.
+        require_numpy()
+        return np.frombuffer(self.wall_grid, dtype=np.uint8).reshape(self.h, self.w)
+
+    def get_wall_mask(self, direction: int) -> np.ndarray:
+        return (self.wall_array & direction) != 0
+
+    def get_opening_counts(self) -> np.ndarray:
+        return OPENING_COUNTS[self.wall_array]
+
+    def get_dead_end_mask(self) -> np.ndarray:
+        return self.get_opening_counts() == 1
+
+    def set_border_walls(self):
+        _set_border_walls(self.wall_grid, self.w, self.h)
+        self.mark_walls_changed()
+
+    def mark_walls_changed(self, indexes: Sequence[int] = None):
+        # Tells everything derived from the walls (fingerprint, distance fields, MazeTrees, wall listeners) that
+        # walls were changed without going through the Maze API. indexes are the nodes that changed (default: all).
+        if indexes is None: indexes = range(self.size)
+        self._wall_hash = None
+        self.wall_version += 1
+        if self._wall_listeners: self._notify_wall_listeners(indexes)
+
+    @property
+    def neighbour_tables(self) -> Tuple[array, array, array, array]:
+        if self._neighbour_tables is None: self._neighbour_tables = get_neighbour_tables(self.w, self.h)
+        return self._neighbour_tables
+
+    def neighbour_indexes(self, index: int) -> Iterator[int]:
+        for table in self.neighbour_tables:
+            neighbour_index = table[index]
+            if neighbour_index != -1: yield neighbour_index
+
+    def open_neighbours(self, index: int) -> Iterator[int]:
+        # Indexes of neighbouring nodes that are not separated from node[index] by a wall.
+        walls = self.wall_grid[index]
+        for direction, table in zip(DIRECTIONS, self.neighbour_tables):
+            if walls & direction: continue
+            neighbour_index = table[index]
+            if neighbour_index != -1: yield neighbour_index
+
+    def get_neighbour_index(self, index: int, direction: int) -> int:
+        return self.neighbour_tables[DIRECTION_POSITIONS[direction]][index]
+
+    def get_direction(self, index: int, neighbour_index: int) -> int:
+        # Wall of node[index] that faces node[neighbour_index] (0 if they are not neighbours).
+        # Vertical offsets are checked first so that 1 wide mazes are handled correctly.
+        offset = neighbour_index - index
+        if offset == self.w and neighbour_index < self.size: return TOP_WALL
+        if offset == -self.w and index >= self.w: return BOTTOM_WALL
+        if offset == 1 and neighbour_index % self.w: return RIGHT_WALL
+        if offset == -1 and index % self.w: return LEFT_WALL
+        return 0
+
+    def distance_field(self, source_index: int) -> array:
+        # Number of steps from node[source_index] to every node (UNREACHED if there is no path), as an array indexed
+        # by node index. Fields are cached until the walls change, so the returned array must not be modified.
+        source_index %= self.size
+        if self._distance_fields_version != self.wall_version:
+            self._distance_fields.clear()
+            self._distance_fields_version = self.wall_version
+
+        distances = self._distance_fields.get(source_index)
+        if distances is not None: return distances
+
+        distances = self.get_distance_field(source_index)
+        if len(self._distance_fields) >= DISTANCE_FIELD_CACHE_SIZE:
+            del self._distance_fields[next(iter(self._distance_fields))]
+        self._distance_fields[source_index] = distances
+        return distances
+
+    def get_distance_field(self, source_index: int) -> array:
+        # Uncached breadth first search behind distance_field.
+        neighbour_tables = list(zip(DIRECTIONS, self.neighbour_tables))
+        wall_grid = self.wall_grid
+
+        distances = array("i", [UNREACHED]) * self.size
+        distances[source_index] = 0
+        unchecked_nodes = [source_index]
+
+        for node_index in unchecked_nodes:
+            walls = wall_grid[node_index]
+            distance = distances[node_index] + 1
+
+            for direction, table in neighbour_tables:
+                if walls & direction: continue
+                neighbour_index = table[node_index]
+                if neighbour_index == -1 or distances[neighbour_index] != UNREACHED: continue
+
+                distances[neighbour_index] = distance
+                unchecked_nodes.append(neighbour_index)
+
+        return distances
+
+    def carve(self, index: int, direction: int):
+        # Removes the wall on the "direction" side of node[index], along with the matching wall of its neighbour.
+        # Carving towards the edge of the maze creates an opening to the outside.
+        neighbour_index = self.neighbour_tables[DIRECTION_POSITIONS[direction]][index]
+        if self._wall_hash is not None:
+            self._update_wall_hash(index, self.wall_grid[index] & direction)
+            if neighbour_index != -1:
+                self._update_wall_hash(neighbour_index, self.wall_grid[neighbour_index] & OPPOSITE_WALLS[direction])
+
+        self.wall_grid[index] &= ~direction
+        if neighbour_index != -1: self.wall_grid[neighbour_index] &= ~OPPOSITE_WALLS[direction]
+        self.wall_version += 1
+        if self._wall_listeners: self._notify_wall_listeners((index, neighbour_index))
+
+    def build(self, index: int, direction: int):
+        neighbour_index = self.neighbour_tables[DIRECTION_POSITIONS[direction]][index]
+        if self._wall_hash is not None:
+            self._update_wall_hash(index, direction & ~self.wall_grid[index])
+            if neighbour_index != -1:
+                self._update_wall_hash(neighbour_index, OPPOSITE_WALLS[direction] & ~self.wall_grid[neighbour_index])
+
+        self.wall_grid[index] |= direction
+        if neighbour_index != -1: self.wall_grid[neighbour_index] |= OPPOSITE_WALLS[direction]
+        self.wall_version += 1
+        if self._wall_listeners: self._notify_wall_listeners((index, neighbour_index))
+
+    def set_walls(self, index: int, walls: int):
+        # Sets node[index]'s walls as given (its neighbours are left unchanged).
+        if self._wall_hash is not None: self._update_wall_hash(index, self.wall_grid[index] ^ walls)
+        self.wall_grid[index] = walls
+        self.wall_version += 1
+        if self._wall_listeners: self._notify_wall_listeners((index,))
+
+    def set_row_walls(self, row: int, row_walls: bytes):
+        # Replaces the walls of every node in a row (row_walls has one byte per node, as in wall_grid).
+        if len(row_walls) != self.w: raise ValueError(f"row_walls has {len(row_walls)} nodes, expected {self.w}.")
+        if self._wall_hash is not None:
+            row_start = row * self.w
+            for index, (old_walls, walls) in enumerate(zip(self.wall_grid[row_start:row_start + self.w], row_walls),
+                                                        row_start):
+                if old_walls != walls: self._update_wall_hash(index, old_walls ^ walls)
+
+        self.wall_grid[row * self.w:(row + 1) * self.w] = row_walls
+        self.wall_version += 1
+        if self._wall_listeners: self._notify_wall_listeners(range(row * self.w, (row + 1) * self.w))
+
+    def add_wall_listener(self, listener: Callable[[Sequence[int]], None]):
+        # listener(indexes) is called after each wall edit with the indexes of the nodes whose walls changed.
+        self._wall_listeners.append(listener)
+
+    def remove_wall_listener(self, listener: Callable[[Sequence[int]], None]):
+        self._wall_listeners.remove(listener)
+
+    def fingerprint(self) -> int:
+        # 64 bit hash of the maze's size, walls, entrance and exit. It is the same in every process for the same maze.
+        # The first call hashes every node; after that, wall edits made through the Maze API keep it up to date.
+        if self._wall_hash is None: self._wall_hash = hash_wall_grid(self.wall_grid)
+        return self._wall_hash ^ get_layout_key(self.w, self.h, self.get_node_index(self.entrance_node),
+                                                 self.get_node_index(self.exit_node))
+
+    def _update_wall_hash(self, index: int, changed_walls: int):
+        if changed_walls: self._wall_hash ^= get_walls_key(index, changed_walls)
+
+    def _notify_wall_listeners(self, indexes: Sequence[int]):
+        if -1 in indexes: indexes = [index for index in indexes if index != -1]
+        for listener in list(self._wall_listeners): listener(indexes)
+
+    def is_open(self, index: int, direction: int) -> bool:
+        return not self.wall_grid[index] & direction
+
     def check_nodes_seperated_by_wall(self, node_1: MazeNode, node_2: MazeNode) -> bool:
         if node_1.y == node_2.y - 1 and node_1.walls & TOP_WALL: return True
         if node_1.y == node_2.y + 1 and node_1.walls & BOTTOM_WALL: return True
@@ -152,22 +460,112 @@ class Maze():
         return False
 
 
-    def generate_blank_maze(self, width: int, height: int, start_filled: bool) -> List[MazeNode]:
-        if start_filled: return self._generate_filled_maze(width, height)
-        return self._generate_empty_maze(width, height)
+    @classmethod
+    def generate_blank_maze(cls, width: int, height: int, start_filled: bool) -> bytearray:
+        if start_filled: return cls._generate_filled_maze(width, height)
+        return cls._generate_empty_maze(width, height)
     
-    def _generate_empty_maze(self, width: int, height: int) -> List[MazeNode]:
-        maze = [MazeNode(i % width, i // width, 0b00000000) for i in range(width * height)]
-        
-        for i in range(0, width): maze[i].walls |= BOTTOM_WALL
-        for i in range((height - 1) * width, width * height): maze[i].walls |= TOP_WALL
-        for i in range(0, width * height, width): maze[i].walls |= LEFT_WALL
-        for i in range(width - 1, height * width, width): maze[i].walls |= RIGHT_WALL
+    @classmethod
+    def _generate_empty_maze(cls, width: int, height: int) -> bytearray:
+        maze = bytearray(width * height)
+        _set_border_walls(maze, width, height)
+        return maze
+
+    @classmethod
+    def _generate_filled_maze(cls, width: int, height: int) -> bytearray:
+        if np is None: return bytearray(b"\x0f" * (width * height))
 
+        maze = bytearray(width * height)
+        np.frombuffer(maze, dtype=np.uint8).fill(0b00001111)
         return maze
 
-    def _generate_filled_maze(self, width: int, height: int) -> List[MazeNode]:
-        return [MazeNode(i % width, i // width, 0b00001111) for i in range(width * height)]
+    def to_bytes(self, packed: bool = True) -> bytes:
+        # Unpacked data uses one byte per node, which is the layout open_mmap needs.
+        flags = (FLAG_PACKED if packed else 0) | (FLAG_START_FILLED if self.start_filled else 0)
+        header = encode_header(self.w, self.h, self.get_node_index(self.entrance_node),
+                                self.get_node_index(self.exit_node), flags)
+        if not packed: return header + bytes(self.wall_grid)
+        return header + pack_walls(self.wall_grid)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Maze:
+        w, h, entrance_index, exit_index, flags = decode_header(data)
+
+        if flags & FLAG_PACKED:
+            wall_grid = unpack_walls(data[MAZE_FILE_HEADER.size:], w * h)
+        else:
+            wall_grid = bytearray(data[MAZE_FILE_HEADER.size:MAZE_FILE_HEADER.size + (w * h)])
+        return cls(w, h, bool(flags & FLAG_START_FILLED), entrance_index, exit_index, wall_grid=wall_grid)
+
+    def save(self, path: str, packed: bool = True):
+        with open(path, "wb") as file:
+            file.write(self.to_bytes(packed))
+
+    @classmethod
+    def create_mmap(cls, path: str, w: int, h: int, start_filled: bool = True, entrance_index: int = 0,
+                     exit_index: int = -1) -> Maze:
+        # Writes a blank, unpacked maze file one row at a time and opens it with open_mmap(path, "r+").
+        flags = FLAG_START_FILLED if start_filled else 0
+        edge_rows = cls.generate_blank_maze(w, min(h, 3), start_filled)
+
+        with open(path, "wb") as file:
+            file.write(encode_header(w, h, entrance_index % (w * h), exit_index % (w * h), flags))
+            file.write(edge_rows[:w])
+            for _ in range(h - 2): file.write(edge_rows[w:2 * w])
+            if h > 1: file.write(edge_rows[-w:])
+
+        return cls.open_mmap(path, "r+")
+
+    @classmethod
+    def open_mmap(cls, path: str, mode: str = "r") -> Maze:
+        # "r" maps the file read-only (can be shared by several processes), "r+" writes changes back to the file
+        # and "c" keeps changes in memory only (copy-on-write).
+        access_modes = {"r": mmap.ACCESS_READ, "r+": mmap.ACCESS_WRITE, "c": mmap.ACCESS_COPY}
+        if mode not in access_modes: raise ValueError(f"\"{mode}\" is not a valid mode (use \"r\", \"r+\" or \"c\").")
+
+        with open(path, "r+b" if mode == "r+" else "rb") as file:
+            mapped_file = mmap.mmap(file.fileno(), 0, access=access_modes[mode])
+
+        w, h, entrance_index, exit_index, flags = decode_header(mapped_file)
+        if flags & FLAG_PACKED:
+            mapped_file.close()
+            raise ValueError("Packed maze files cannot be memory-mapped (save with packed=False).")
+        if len(mapped_file) < MAZE_FILE_HEADER.size + (w * h):
+            mapped_file.close()
+            raise ValueError("Maze file is shorter than its header says.")
+
+        wall_grid = memoryview(mapped_file)[MAZE_FILE_HEADER.size:MAZE_FILE_HEADER.size + (w * h)]
+        maze = cls(w, h, bool(flags & FLAG_START_FILLED), entrance_index, exit_index, wall_grid=wall_grid)
+        maze._mmap = mapped_file
+        # Memory-mapped mazes can be too big for the neighbour arrays, so neighbours are worked out on lookup.
+        maze._neighbour_tables = tuple(ComputedNeighbourTable(direction, w, h) for direction in DIRECTIONS)
+        return maze
+
+    def flush(self):
+        if self._mmap is not None: self._mmap.flush()
+
+    def close(self):
+        # Releases the memory-mapped file behind a maze opened with open_mmap/create_mmap.
+        if self._mmap is None: return
+        try:
+            self.wall_grid.release()
+            self._mmap.close()
+        except BufferError:
+            # Arrays made by wall_array share the file's memory directly, so the file stays open (and the maze usable).
+            self.wall_grid = memoryview(self._mmap)[MAZE_FILE_HEADER.size:MAZE_FILE_HEADER.size + self.size]
+            raise BufferError("Maze can't be closed while arrays that share its walls (from wall_array) still exist. "
+                              "Delete them, then call close again.") from None
+
+    def __enter__(self) -> Maze:
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @classmethod
+    def load(cls, path: str) -> Maze:
+        with open(path, "rb") as file:
+            return cls.from_bytes(file.read())
 
     @classmethod
     def get_generated_maze(cls, maze: Maze,
@@ -185,7 +583,7 @@ class Maze():
         if x < 0 or x >= self.w: return None
         if y < 0 or y >= self.h: return None
 
-        return self.maze_body[(y * self.w) + x]
+        return MazeNode(x, y, 0, self)
 
     def get_node_index(self, node: MazeNode):
         return node.x + (node.y * self.w)
@@ -196,19 +594,19 @@ class Maze():
 
     def _get_node_neighbour_above(self, x, y) -> Union[MazeNode, None]:
         if -1 < y < self.h - 1:
-            return self.maze_body[((y + 1) * self.w) + x]
+            return MazeNode(x, y + 1, 0, self)
     
     def _get_node_neighbour_below(self, x, y) -> Union[MazeNode, None]:
         if self.h >= y > 0: 
-            return self.maze_body[((y - 1) * self.w) + x]
+            return MazeNode(x, y - 1, 0, self)
     
     def _get_node_neighbour_left(self, x, y) -> Union[MazeNode, None]:
         if self.w >= x > 0:
-            return self.maze_body[(y * self.w) + x - 1]
+            return MazeNode(x - 1, y, 0, self)
 
     def _get_node_neighbour_right(self, x, y) -> Union[MazeNode, None]:
         if -1 < x < self.w - 1:
-            return self.maze_body[(y * self.w) + x + 1]
+            return MazeNode(x + 1, y, 0, self)
     
 
     def __getitem__(self, index):
@@ -229,4 +627,31 @@ class Maze():
     
     def __str__(self) -> str:
         return f"Maze({self.w}x{self.h})"
-    
\ No newline at end of file
+
+
+
+class MazeBody:
+    # Read-only sequence of MazeNode views over a Maze's wall_grid.
+    # Behaves like the List[MazeNode] that Maze.maze_body used to be.
+    __slots__ = ("_maze",)
+
+    def __init__(self, maze: Maze) -> None:
+        self._maze = maze
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        size = self._maze.w * self._maze.h
+        if index < 0: index += size
+        if index < 0 or index >= size: raise IndexError("maze node index out of range")
+
+        return MazeNode(index % self._maze.w, index // self._maze.w, 0, self._maze)
+
+    def __len__(self) -> int:
+        return len(self._maze.wall_grid)
+
+    def __iter__(self):
+        maze = self._maze
+        for index in range(len(maze.wall_grid)):
+            yield MazeNode(index % maze.w, index // maze.w, 0, maze)
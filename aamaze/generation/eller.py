@@ -1,88 +1,110 @@
 from __future__ import annotations
 
-import random
-from typing import Any, Dict, List, Set, Union
+from typing import Any, Dict, List
 
 from aamaze.base_maze import (BOTTOM_WALL, LEFT_WALL, RIGHT_WALL, TOP_WALL,
-                              GenerationAlgorithm, Maze, MazeNode)
+                              GenerationAlgorithm, Maze, get_random_generator)
 
 
 class Eller(GenerationAlgorithm):
-    def __init__(self, maze: Maze) -> None:
-        super().__init__(maze)
+    def __init__(self, maze: Maze, seed: Any = None) -> None:
+        super().__init__(maze, seed)
+
+    @classmethod
+    def iter_rows(cls, width: int, seed: Any = None, height: int = None) -> EllerRowStream:
+        # Generates a maze row by row without a Maze object (see EllerRowStream).
+        return EllerRowStream(width, seed, height)
     
     def generate_maze(self) -> Maze:
-        row = 0
-
-        node_dict: Dict[int, int] = {}
-
-        while row < self.maze.h:
-            
-            self.remove_redundant_nodes(node_dict, row)
-            self.add_nodes_to_dict(row, node_dict)
-
-            # Create horizontal connections.
-            for i in range(1, self.maze.w):
-                # Don't make connections between nodes in the same set (already have path between them).
-                if node_dict[i + (row * self.maze.w)] == node_dict[i - 1 + (row * self.maze.w)]: continue
-
-                if random.randint(0, 2) > 0:
-                    self.merge_nodes(node_dict, node_dict[i + (row * self.maze.w)], node_dict[i - 1 + (row * self.maze.w)])
-                    self.remove_walls(self.maze[i + (row * self.maze.w)], self.maze[i - 1 + (row * self.maze.w)])
-            
-            row += 1
-
-            # Do not make upwards connections on the final row (out of bounds error).
-            # Instead, merge any remaining sets together to form one final set containing all MazeNode indexes.
-            if row == self.maze.h:
-                for i in range(1, self.maze.w):
-                    if node_dict[i + ((row - 1) * self.maze.w)] != node_dict[i - 1 + ((row - 1) * self.maze.w)]:
-                        self.merge_nodes(node_dict, node_dict[i + ((row - 1) * self.maze.w)], node_dict[i - 1 + ((row - 1) * self.maze.w)])
-                        self.remove_walls(self.maze[i + ((row - 1) * self.maze.w)], self.maze[i - 1 + ((row - 1) * self.maze.w)])
-                continue
-
-            # Get Nodes which can be used to form an upwards connection and group them by their respective set
-            # Need to be on correct row to be eligible.
-            eligible_upward_nodes: Dict[int: List[int]] = {}
-
-            for node_index in list(node_dict.keys()):
-                if self.maze.w * row > node_index >= self.maze.w * (row - 1):
-                    if not eligible_upward_nodes.get(node_dict[node_index]):
-                        eligible_upward_nodes[node_dict[node_index]] = []
-                    eligible_upward_nodes[node_dict[node_index]].append(node_index)
-
-            # Make one upward connection for each Set.
-            for key in list(eligible_upward_nodes.keys()):
-                node = self.maze[random.choice(eligible_upward_nodes[key])]
-                node_dict[node.x + ((node.y + 1) * self.maze.w)] = key
-                self.remove_walls(node, self.maze[node.x + ((node.y + 1) * self.maze.w)])
-            
-            # Make random upward connections for each eligible MazeNode.
-            for key in list(eligible_upward_nodes.keys()):
-                for index in eligible_upward_nodes[key]:
-                    if random.randint(0, 2): continue
-                    node_dict[index + self.maze.w] = node_dict[index]
-                    self.remove_walls(self.maze[index], self.maze[index + self.maze.w])
-        
-
-        self.create_entrance_and_exit()
+        rows = EllerRowStream(self.maze.w, self.random, self.maze.h)
 
+        for row, row_walls in enumerate(rows):
+            self.maze.set_row_walls(row, row_walls)
 
-        
-    def add_nodes_to_dict(self, row: int, node_ids: Dict[int, int]):
-        for i in range(self.maze.w):
-            node_index = i + (row * self.maze.w)
-
-            if node_ids.get(node_index, -1) == -1:
-                node_ids[node_index] = node_index
-        
-    def merge_nodes(self, node_dict: Dict[int, int], index: int, other_index: int):
-        keys = list(node_dict.keys())
-        for key in keys:
-            if node_dict[key] == other_index:
-                node_dict[key] = index
-
-    def remove_redundant_nodes(self, node_dict: Dict[int , int], row: int):
-        for key in list(node_dict.keys()):
-            if key < self.maze.w * (row - 2):
-                node_dict.pop(key)
+        self.create_entrance_and_exit()
+        return self.maze
+
+
+
+class EllerRowStream:
+    # Iterator that yields the walls of each finished maze row as bytes (same layout as a row of Maze.wall_grid).
+    # Only the row currently being built is kept in memory, so memory use is O(width) for any number of rows.
+    # If height is None, rows are generated until finish() is called, which closes off and returns the last row.
+
+    # Sets are tracked with a union-find over the positions in the current row, so each row costs O(width).
+    def __init__(self, width: int, seed: Any = None, height: int = None) -> None:
+        self.width = width
+        self.height = height
+        self.random = get_random_generator(seed)
+        self.rows_generated = 0
+
+        self._row = bytearray(b"\x0f" * width)
+        self._parents: List[int] = list(range(width))
+        self._finished = False
+
+    def __iter__(self) -> EllerRowStream:
+        return self
+
+    def __next__(self) -> bytes:
+        if self._finished: raise StopIteration
+        if self.height is not None and self.rows_generated >= self.height - 1: return self.finish()
+
+        self._create_horizontal_connections()
+
+        # Get the nodes in each set (in row order).
+        set_members: Dict[int, List[int]] = {}
+        for x in range(self.width):
+            root = self._find(x)
+            if root not in set_members: set_members[root] = [x]
+            else: set_members[root].append(x)
+
+        # Make one upward connection for each set, then random upward connections for the remaining nodes.
+        # Nodes in the next row that are connected to the same set are linked to that set's first connected node.
+        next_row = bytearray(b"\x0f" * self.width)
+        next_parents = list(range(self.width))
+        for members in set_members.values():
+            connected_x = self.random.choice(members)
+            leader_x = -1
+            for x in members:
+                if x != connected_x and self.random.randint(0, 2): continue
+                self._row[x] &= ~TOP_WALL
+                next_row[x] &= ~BOTTOM_WALL
+                if leader_x == -1: leader_x = x
+                next_parents[x] = leader_x
+
+        finished_row = bytes(self._row)
+        self._row = next_row
+        self._parents = next_parents
+        self.rows_generated += 1
+        return finished_row
+
+    def finish(self) -> bytes:
+        # Closes off the current row by joining every remaining set, so that the streamed maze is fully connected.
+        if self._finished: raise StopIteration
+
+        self._create_horizontal_connections()
+        for x in range(1, self.width):
+            if self._find(x) != self._find(x - 1): self._connect(x)
+
+        self._finished = True
+        self.rows_generated += 1
+        return bytes(self._row)
+
+    def _create_horizontal_connections(self):
+        for x in range(1, self.width):
+            # Don't make connections between nodes in the same set (already have path between them).
+            if self._find(x) == self._find(x - 1): continue
+            if self.random.randint(0, 2) > 0: self._connect(x)
+
+    def _connect(self, x: int):
+        # Removes the wall between node x - 1 and node x and merges their sets.
+        self._row[x - 1] &= ~RIGHT_WALL
+        self._row[x] &= ~LEFT_WALL
+        self._parents[self._find(x)] = self._find(x - 1)
+
+    def _find(self, x: int) -> int:
+        parents = self._parents
+        while parents[x] != x:
+            parents[x] = parents[parents[x]]
+            x = parents[x]
+        return x
@@ -1,79 +1,106 @@
 import random
-from typing import List, Union
+from typing import Any, Callable, List, Union
 
-from aamaze.base_maze import GenerationAlgorithm, Maze, MazeNode
+from aamaze.base_maze import DIRECTIONS, GenerationAlgorithm, Maze
 
+# A selection strategy takes the number of working nodes and a random number generator, and returns the position
+# of the next node to grow from. 0 is the oldest working node and count - 1 is the newest; the positions in between
+# are in no particular order (nodes are moved when others are removed).
+SelectionStrategy = Callable[[int, random.Random], int]
 
-class GrowingTree(GenerationAlgorithm):
-    def __init__(self, maze: Maze, mode: str = "random") -> None:
-        super().__init__(maze)
+RANDOM_NEWEST_SPLIT_PREFIX = "random-newest-split-"
 
-        self.node_selection_mode: str = mode
 
-        self.custom_selection_value: int = self._get_custom_selection_value()
+def select_random(count: int, rng: random.Random) -> int:
+    return rng.randrange(0, count)
 
-        self.working_nodes: List[MazeNode]
-        self.visited_nodes: List[MazeNode]
-    
-    def generate_maze(self) -> Maze:
-        self.working_nodes = [random.choice(self.maze.maze_body)]
-        self.visited_nodes = [self.working_nodes[0]]
+def select_newest(count: int, rng: random.Random) -> int:
+    return count - 1
 
-        while len(self.working_nodes) > 0:
-            current_node = self.get_node()
-            neighbours = self.maze.get_node_neighbours(current_node)
-            unvisited_neighbours = [neighbour for neighbour in neighbours if neighbour not in self.visited_nodes]
+def select_oldest(count: int, rng: random.Random) -> int:
+    return 0
 
-            if len(unvisited_neighbours) == 0: 
-                self.working_nodes.remove(current_node)
-                continue
+def get_random_newest_split_strategy(split_value: int) -> SelectionStrategy:
+    def select_random_newest_split(count: int, rng: random.Random) -> int:
+        if rng.randrange(0, 100) > split_value: return rng.randrange(0, count)
+        return count - 1
+    return select_random_newest_split
+
+
+SELECTION_STRATEGIES = {"random": select_random, "newest": select_newest, "oldest": select_oldest}
 
-            random_neighbour = random.choice(unvisited_neighbours)
-            self.working_nodes.append(random_neighbour)
-            self.visited_nodes.append(random_neighbour)
-            self.remove_walls(current_node, random_neighbour)
 
+def get_selection_strategy(mode: Union[str, SelectionStrategy]) -> SelectionStrategy:
+    if callable(mode): return mode
+    if mode in SELECTION_STRATEGIES: return SELECTION_STRATEGIES[mode]
 
-    def get_node(self):
-        if self.node_selection_mode == "random":
-            return self.get_random_node(self.working_nodes)
+    if mode.startswith(RANDOM_NEWEST_SPLIT_PREFIX) and mode[len(RANDOM_NEWEST_SPLIT_PREFIX):].isdigit():
+        return get_random_newest_split_strategy(int(mode[len(RANDOM_NEWEST_SPLIT_PREFIX):]))
 
-        if self.node_selection_mode == "newest":
-            return self.get_newest_added_node(self.working_nodes)
-        
-        if self.node_selection_mode.find("random-newest-split-") != -1:
-            return self.get_random_newest_split_node(self.working_nodes, self.custom_selection_value)
-        
-        raise ValueError(f"\"{self.node_selection_mode}\" is not a valid mode")
+    raise ValueError(f"\"{mode}\" is not a valid mode")
 
-    @staticmethod
-    def get_random_node(nodes: List[MazeNode]) -> MazeNode:
-        return random.choice(nodes)
 
-    @staticmethod
-    def get_newest_added_node(nodes: List[MazeNode]) -> MazeNode:
-        return nodes[-1]
-    
-    @classmethod
-    def get_random_newest_split_node(cls, nodes: List[MazeNode], split_value: int) -> MazeNode:
-        rand_num: int = random.randrange(0, 100)
-        if rand_num > split_value:
-            return cls.get_random_node(nodes)
-        return cls.get_newest_added_node(nodes)
+class GrowingTree(GenerationAlgorithm):
+    def __init__(self, maze: Maze, mode: Union[str, SelectionStrategy] = "random", seed: Any = None) -> None:
+        super().__init__(maze, seed)
+
+        self.node_selection_mode = mode
+
+        # Working nodes are stored from working_nodes[working_start] onwards, with the oldest first and the newest last.
+        self.working_nodes: List[int]
+        self.working_start: int
+        self.visit_status: bytearray
 
+    @property
+    def node_selection_mode(self) -> Union[str, SelectionStrategy]:
+        return self._node_selection_mode
 
-    def _get_custom_selection_value(self):
-        number_str: str = ""
+    @node_selection_mode.setter
+    def node_selection_mode(self, mode: Union[str, SelectionStrategy]):
+        self._selection_strategy = get_selection_strategy(mode)
+        self._node_selection_mode = mode
 
-        if self.node_selection_mode.find("random-newest-split-") != -1:
-            for char in self.node_selection_mode[self.node_selection_mode.find("random-newest-split-") + 20:]:
-                if char.isnumeric:
-                    number_str += char
-        if len(number_str) == 0: return 0
+    def generate_maze(self) -> Maze:
+        neighbour_tables = list(zip(DIRECTIONS, self.maze.neighbour_tables))
 
-        return int(number_str)
+        self.working_nodes = [self.random.randrange(0, self.maze.size)]
+        self.working_start = 0
+        self.visit_status = bytearray(self.maze.size)
+        self.visit_status[self.working_nodes[0]] = True
 
-        
+        while len(self.working_nodes) > self.working_start:
+            position = self.working_start + self._selection_strategy(len(self.working_nodes) - self.working_start,
+                                                                     self.random)
+            current_node = self.working_nodes[position]
 
+            unvisited_neighbours = []
+            for direction, table in neighbour_tables:
+                neighbour = table[current_node]
+                if neighbour != -1 and not self.visit_status[neighbour]: unvisited_neighbours.append((direction, neighbour))
 
+            if len(unvisited_neighbours) == 0:
+                self.remove_working_node(position)
+                continue
 
+            random_direction, random_neighbour = self.random.choice(unvisited_neighbours)
+            self.working_nodes.append(random_neighbour)
+            self.visit_status[random_neighbour] = True
+            self.maze.carve(current_node, random_direction)
+
+        return self.maze
+
+    def remove_working_node(self, position: int):
+        # O(1) removal that keeps the oldest node first and the newest node last: the newest node is popped, and any
+        # other node is replaced by the second oldest node, whose place is taken by the oldest.
+        if position == len(self.working_nodes) - 1:
+            self.working_nodes.pop()
+        else:
+            if position != self.working_start:
+                self.working_nodes[position] = self.working_nodes[self.working_start + 1]
+                self.working_nodes[self.working_start + 1] = self.working_nodes[self.working_start]
+            self.working_start += 1
+
+        # Drop the removed nodes from the front of the list once they make up most of it.
+        if self.working_start > 32 and self.working_start * 2 > len(self.working_nodes):
+            del self.working_nodes[:self.working_start]
+            self.working_start = 0
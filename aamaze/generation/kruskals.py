@@ -1,76 +1,70 @@
-from typing import Dict, List, Set
+from array import array
+from typing import Any, List
 
-from aamaze.base_maze import (BOTTOM_WALL, LEFT_WALL, RIGHT_WALL, TOP_WALL,
-                              GenerationAlgorithm, Maze, MazeNode)
+from aamaze.base_maze import RIGHT_WALL, TOP_WALL, GenerationAlgorithm, Maze
 
 
 class Kruskals(GenerationAlgorithm):
-    def __init__(self, maze: Maze) -> None:
-        super().__init__(maze)
+    def __init__(self, maze: Maze, seed: Any = None) -> None:
+        super().__init__(maze, seed)
 
-        self.walls: Set[str]  = self.get_all_walls(maze)
-        self.node_index_set_dict: Dict[int, int] = self.get_start_node_index_set_dict(maze)
-        self.set_dict: Dict[int: set] = {}
+        # Edges are stored as the index of the node to the left of (horizontal) or below (vertical) the wall.
+        self.horizontal_edges: array = self.get_horizontal_edges(maze)
+        self.vertical_edges: array = self.get_vertical_edges(maze)
 
-    
-    def generate_maze(self) -> Maze:
-        
-        while len(self.walls) > 0:
-            current_wall = self.walls.pop()
-
-            seperator_index = current_wall.find(",")
-            node1_index = int(current_wall[:seperator_index])
-            node2_index = int(current_wall[seperator_index + 1:])
-
-            node1_set_index = self.node_index_set_dict[node1_index]
-            node2_set_index = self.node_index_set_dict[node2_index]
+        # Disjoint-set forest over node indexes.
+        self.parents: array = array("i", range(maze.size))
+        self.ranks: bytearray = bytearray(maze.size)
 
-            if node1_set_index == node2_set_index and node1_set_index != -1: continue
 
-            if node1_set_index == -1 and node2_set_index == -1:
-                new_set_index = len(self.set_dict.keys())
-                self.set_dict[new_set_index] = {node1_index, node2_index}
-                self.node_index_set_dict[node1_index] = new_set_index
-                self.node_index_set_dict[node2_index] = new_set_index
-
-            elif node1_set_index == -1:
-                self.set_dict[node2_set_index].add(node1_index)
-                self.node_index_set_dict[node1_index] = node2_set_index
+    def generate_maze(self) -> Maze:
+        horizontal_edge_count = len(self.horizontal_edges)
+        edge_order: List[int] = list(range(horizontal_edge_count + len(self.vertical_edges)))
+        self.random.shuffle(edge_order)
+
+        for edge in edge_order:
+            if edge < horizontal_edge_count:
+                node1_index = self.horizontal_edges[edge]
+                node2_index = node1_index + 1
+                direction = RIGHT_WALL
+            else:
+                node1_index = self.vertical_edges[edge - horizontal_edge_count]
+                node2_index = node1_index + self.maze.w
+                direction = TOP_WALL
 
-            elif node2_set_index == -1:
-                self.set_dict[node1_set_index].add(node2_index) 
-                self.node_index_set_dict[node2_index] = node1_set_index
+            # Walls that are already open still join their nodes' sets.
+            if self.union(node1_index, node2_index) and not self.maze.is_open(node1_index, direction):
+                self.maze.carve(node1_index, direction)
 
-            else:
-                self.set_dict[node1_set_index] = self.set_dict[node1_set_index].union(self.set_dict[node2_set_index])
-                self.set_dict[node2_set_index] = None
-                for key in self.node_index_set_dict.keys():
-                    if self.node_index_set_dict[key] == node2_set_index: self.node_index_set_dict[key] = node1_set_index
-                self.node_index_set_dict[node2_index] = node1_set_index
-            
-            self.remove_walls(self.maze[node1_index], self.maze[node2_index])
-        
         return self.maze
 
 
-    def get_start_node_index_set_dict(self, maze: Maze) -> Dict[int, int]:
-        return {node_index: -1 for node_index in range(len(maze.maze_body))}
+    def find(self, node_index: int) -> int:
+        parents = self.parents
+        while parents[node_index] != node_index:
+            parents[node_index] = parents[parents[node_index]]
+            node_index = parents[node_index]
+        return node_index
 
+    def union(self, node1_index: int, node2_index: int) -> bool:
+        # Returns False if both nodes were already in the same set.
+        root1 = self.find(node1_index)
+        root2 = self.find(node2_index)
+        if root1 == root2: return False
+
+        if self.ranks[root1] < self.ranks[root2]: root1, root2 = root2, root1
+        self.parents[root2] = root1
+        if self.ranks[root1] == self.ranks[root2]: self.ranks[root1] += 1
+        return True
 
-    def get_all_walls(self, maze: Maze) -> Set[MazeNode]:
-        maze_body = maze.maze_body
-        walls = set()
-        for node in maze_body:
-            if node.walls & TOP_WALL and node.y > 0:
-                walls.add(self.create_wall_string(node.x, node.y, node.x, node.y - 1, maze.w))
-            if node.walls & LEFT_WALL and node.x > 0:
-                walls.add(self.create_wall_string(node.x, node.y, node.x - 1, node.y, maze.w))
-            
-        return walls
 
     @staticmethod
-    def create_wall_string(n1x: int, n1y: int, n2x: int, n2y: int, maze_width: int) -> str:
-        if n1x > n2x or n1y > n2y:
-            return f"{n2x + (n2y * maze_width)},{n1x + (n1y * maze_width)}"
+    def get_horizontal_edges(maze: Maze) -> array:
+        edges = array("i")
+        for row_start in range(0, maze.size, maze.w):
+            edges.extend(range(row_start, row_start + maze.w - 1))
+        return edges
 
-        return f"{n1x + (n1y * maze_width)},{n2x + (n2y * maze_width)}"
+    @staticmethod
+    def get_vertical_edges(maze: Maze) -> array:
+        return array("i", range(0, maze.size - maze.w))
@@ -1,51 +1,57 @@
-import random
-from typing import Dict, List
+from typing import Any, List
 
-from aamaze.base_maze import GenerationAlgorithm, Maze, MazeNode
+from aamaze.base_maze import DIRECTIONS, GenerationAlgorithm, Maze
 
 
 class Prims(GenerationAlgorithm):
-    def __init__(self, maze: Maze) -> None:
-        super().__init__(maze)
+    def __init__(self, maze: Maze, seed: Any = None) -> None:
+        super().__init__(maze, seed)
+
+        self.visit_status: bytearray = self.generate_visit_status(self.maze.size)
+
+        # Unvisited nodes next to the visited area. frontier_status stops a node being added more than once.
+        self.frontier_nodes: List[int] = []
+        self.frontier_status: bytearray = self.generate_visit_status(self.maze.size)
 
-        self.visited_nodes: List[int] = []
-        self.visit_status: Dict[int, bool] = self.generate_visit_status_dict(self.maze.size)
 
-    
     def generate_maze(self) -> Maze:
-        self.visited_nodes.append(random.randint(0, self.maze.size - 1))
-        self.visit_status[self.visited_nodes[-1]] = True
-
-        while len(self.visited_nodes) < self.maze.size:
-            adjacent_node_indexes = self.get_adjacent_nodes()
-
-            self.visited_nodes.append(adjacent_node_indexes[random.randint(0, len(adjacent_node_indexes) - 1)])
-            self.visit_status[self.visited_nodes[-1]] = True
-
-            new_node_neighbours = self.maze.get_neighbours_from_coordinates(self.visited_nodes[-1] % self.maze.w,
-             self.visited_nodes[-1] // self.maze.w)
-            random.shuffle(new_node_neighbours)
-            
-            for neighbour in new_node_neighbours:
-                if self.visit_status[neighbour.x + (neighbour.y * self.maze.w)]:
-                    self.remove_walls(self.maze[self.visited_nodes[-1]], neighbour)
+        start_node_index = self.random.randint(0, self.maze.size - 1)
+        self.visit_status[start_node_index] = True
+        self.add_frontier_nodes(start_node_index)
+
+        while len(self.frontier_nodes) > 0:
+            node_index = self.pop_random_frontier_node()
+            self.visit_status[node_index] = True
+
+            directions = list(DIRECTIONS)
+            self.random.shuffle(directions)
+
+            for direction in directions:
+                neighbour_index = self.maze.get_neighbour_index(node_index, direction)
+                if neighbour_index != -1 and self.visit_status[neighbour_index]:
+                    self.maze.carve(node_index, direction)
                     break
-        
+
+            self.add_frontier_nodes(node_index)
+
         return self.maze
-            
 
-    
+
+
     @staticmethod
-    def generate_visit_status_dict(num_nodes: int) -> Dict[int, bool]:
-        return {index: False for index in range(0, num_nodes)}
-    
-    def get_adjacent_nodes(self):
-        output = []
-
-        for node_index in self.visited_nodes:
-            neighbours = self.maze.get_neighbours_from_coordinates(node_index % self.maze.w, node_index // self.maze.w)
-            for neighbour in neighbours:
-                if not self.visit_status[neighbour.x + (neighbour.y * self.maze.w)]: 
-                    output.append(neighbour.x + (neighbour.y * self.maze.w))
-            
-        return output
+    def generate_visit_status(num_nodes: int) -> bytearray:
+        return bytearray(num_nodes)
+
+    def add_frontier_nodes(self, node_index: int):
+        for neighbour_index in self.maze.neighbour_indexes(node_index):
+            if self.visit_status[neighbour_index] or self.frontier_status[neighbour_index]: continue
+            self.frontier_status[neighbour_index] = True
+            self.frontier_nodes.append(neighbour_index)
+
+    def pop_random_frontier_node(self) -> int:
+        # Swap the chosen node with the last one so that it can be removed in O(1).
+        position = self.random.randint(0, len(self.frontier_nodes) - 1)
+        node_index = self.frontier_nodes[position]
+        self.frontier_nodes[position] = self.frontier_nodes[-1]
+        self.frontier_nodes.pop()
+        return node_index
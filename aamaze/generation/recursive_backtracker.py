@@ -1,44 +1,45 @@
-import random
-from typing import List
+from typing import Any, List
 
-from aamaze.base_maze import (BOTTOM_WALL, LEFT_WALL, RIGHT_WALL, TOP_WALL,
-                              GenerationAlgorithm, Maze, MazeNode)
+from aamaze.base_maze import DIRECTIONS, GenerationAlgorithm, Maze
 
 
 class RecursiveBacktracker(GenerationAlgorithm):
-    def __init__(self, maze: Maze) -> None:
-        super().__init__(maze)
-        self.visited_nodes: List[MazeNode] = []
-    
-    def generate_maze(self) -> Maze:
-        if self.maze.size <= 1: return self.maze.maze_body
-
-        # Pick a start Node
-        self.visited_nodes.append(self.maze.get_node_from_coordinates(0, 0))
-        node_index = 0
+    def __init__(self, maze: Maze, start_index: int = 0, seed: Any = None) -> None:
+        super().__init__(maze, seed)
+        # Negative indexes count back from the end, as they do for Maze[...].
+        if not -maze.size <= start_index < max(1, maze.size):
+            raise IndexError(f"start_index {start_index} is out of range for a maze of {maze.size} nodes.")
+        self.start_index = start_index % max(1, maze.size)
 
-        while len(self.visited_nodes) < self.maze.size:
+        self.visit_status: bytearray = bytearray(maze.size)
+        self.node_stack: List[int] = []
 
+    def generate_maze(self) -> Maze:
+        if self.maze.size <= 1: return self.maze
 
-            current_neighbour_nodes = self.maze.get_neighbours_from_coordinates(self.visited_nodes[node_index].x,
-             self.visited_nodes[node_index].y)
+        neighbour_tables = list(zip(DIRECTIONS, self.maze.neighbour_tables))
 
-            while True:
+        self.node_stack.append(self.start_index)
+        self.visit_status[self.start_index] = True
 
-                if len(current_neighbour_nodes) <= 0:
-                    node_index -= 1
-                    break
+        while len(self.node_stack) > 0:
+            node_index = self.node_stack[-1]
 
-                random_neighbour_node = current_neighbour_nodes.pop(random.randint(0,
-                 len(current_neighbour_nodes) - 1))
-                
-                if random_neighbour_node in self.visited_nodes: continue
+            unvisited_neighbours = []
+            for direction, table in neighbour_tables:
+                neighbour_index = table[node_index]
+                if neighbour_index != -1 and not self.visit_status[neighbour_index]:
+                    unvisited_neighbours.append((direction, neighbour_index))
 
-                self.remove_walls(self.visited_nodes[node_index], random_neighbour_node)
+            # Dead end, backtrack to the previous node.
+            if len(unvisited_neighbours) == 0:
+                self.node_stack.pop()
+                continue
 
+            random_direction, neighbour_index = self.random.choice(unvisited_neighbours)
 
-                self.visited_nodes.append(random_neighbour_node)
-                node_index = len(self.visited_nodes) - 1
-                break
+            self.maze.carve(node_index, random_direction)
+            self.visit_status[neighbour_index] = True
+            self.node_stack.append(neighbour_index)
 
         return self.maze
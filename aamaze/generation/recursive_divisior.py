@@ -1,63 +1,65 @@
-import random
-from typing import List
+from typing import Any, List, Tuple
 
-from aamaze.base_maze import GenerationAlgorithm, Maze, MazeNode
+from aamaze.base_maze import (BOTTOM_WALL, LEFT_WALL, RIGHT_WALL, TOP_WALL,
+                              GenerationAlgorithm, Maze)
+
+# (x, y, width, height) of a rectangular region of the maze, (x, y) being its bottom left node.
+Area = Tuple[int, int, int, int]
 
 
 class RecursiveDivisor(GenerationAlgorithm):
-    def __init__(self, maze: Maze) -> None:
-        super().__init__(maze)
-    
+    def __init__(self, maze: Maze, seed: Any = None) -> None:
+        super().__init__(maze, seed)
+
     def generate_maze(self) -> Maze:
-        self.bisect_area(self.maze.maze_body, self.maze.w, self.maze.h)
-    
-    @classmethod
-    def bisect_area(cls, maze: List[MazeNode], width: int, height: int):
+        self.bisect_area(0, 0, self.maze.w, self.maze.h)
+        return self.maze
 
-        if width == 2 and height > 2:
-            cls._bisect_maze_in_x_plane(maze, width, height)
-            return 
-        if height == 2 and width > 2:
-            cls._bisect_maze_in_y_plane(maze, width, height)
-            return 
+    def bisect_area(self, x: int, y: int, width: int, height: int):
+        # Areas still to be divided are kept on an explicit stack (instead of recursing), so tall or wide mazes
+        # can't hit the recursion limit. The second half of each area is pushed first so that the first half is
+        # divided first.
+        area_stack: List[Area] = [(x, y, width, height)]
 
+        while len(area_stack) > 0:
+            x, y, width, height = area_stack.pop()
 
-        if random.randint(0, 1):
-            cls._bisect_maze_in_y_plane(maze, width, height)
-        else:
-            cls._bisect_maze_in_x_plane(maze, width, height)
+            if width == 2 and height > 2:
+                self._bisect_maze_in_x_plane(area_stack, x, y, width, height)
+            elif height == 2 and width > 2:
+                self._bisect_maze_in_y_plane(area_stack, x, y, width, height)
+            elif self.random.randint(0, 1):
+                self._bisect_maze_in_y_plane(area_stack, x, y, width, height)
+            else:
+                self._bisect_maze_in_x_plane(area_stack, x, y, width, height)
 
 
-    @classmethod
-    def _bisect_maze_in_x_plane(cls, maze: List[MazeNode], width: int, height: int):
+    def _bisect_maze_in_x_plane(self, area_stack: List[Area], x: int, y: int, width: int, height: int):
         if height <= 1: return
-        area_1 = maze[ :(height // 2) * width]
-        area_2 = maze[(height // 2) * width: ]
-
         h1 = height // 2
 
-        for i in range((h1 - 1) * width, h1* width): 
-            cls.add_walls(maze[i], maze[i + width])
-        
-        opening_index = (h1 * width) + random.randint(0, width - 1)
-        cls.remove_walls(maze[opening_index], maze[opening_index - width])
-
-        cls.bisect_area(area_1, width, h1)
-        cls.bisect_area(area_2, width, height - h1)
-    
-    @classmethod
-    def _bisect_maze_in_y_plane(cls, maze: List[MazeNode], width: int, height: int):
-        if width <= 1: return
-        area_1 = [maze[x + (y * width)] for y in range(height) for x in range(0, width // 2) ]
-        area_2 = [maze[x + (y * width)] for y in range(height) for x in range(width // 2, width)]
+        # Wall along the top of the area's row h1 - 1, with one opening in it.
+        wall_start = x + ((y + h1 - 1) * self.maze.w)
+        for i in range(wall_start, wall_start + width):
+            self.maze.build(i, TOP_WALL)
 
+        opening_index = wall_start + self.maze.w + self.random.randint(0, width - 1)
+        self.maze.carve(opening_index, BOTTOM_WALL)
+
+        area_stack.append((x, y + h1, width, height - h1))
+        area_stack.append((x, y, width, h1))
+
+    def _bisect_maze_in_y_plane(self, area_stack: List[Area], x: int, y: int, width: int, height: int):
+        if width <= 1: return
         w1 = width // 2
 
-        for i in range(w1, width * height, width): 
-            cls.add_walls(maze[i], maze[i - 1])
+        # Wall along the left of the area's column w1, with one opening in it.
+        wall_start = x + w1 + (y * self.maze.w)
+        for i in range(wall_start, wall_start + (height * self.maze.w), self.maze.w):
+            self.maze.build(i, LEFT_WALL)
 
-        opening_index = w1 - 1 + (random.randint(0, height - 1) * width)
-        cls.remove_walls(maze[opening_index], maze[opening_index + 1])
+        opening_index = wall_start - 1 + (self.random.randint(0, height - 1) * self.maze.w)
+        self.maze.carve(opening_index, RIGHT_WALL)
 
-        cls.bisect_area(area_1, w1, height)
-        cls.bisect_area(area_2, width - w1, height)
+        area_stack.append((x + w1, y, width - w1, height))
+        area_stack.append((x, y, w1, height))
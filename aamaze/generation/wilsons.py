@@ -1,85 +1,68 @@
-import random
-from typing import List
+from array import array
+from typing import Any, List
 
-from aamaze.base_maze import GenerationAlgorithm, Maze, MazeNode
+from aamaze.base_maze import DIRECTIONS, GenerationAlgorithm, Maze
 
 
 class Wilsons(GenerationAlgorithm):
-    def __init__(self, maze: Maze) -> None:
-        super().__init__(maze)
-    
-        self.unvisited_nodes: List[MazeNode]
-        self.visited_nodes: List[MazeNode]
-        self.current_nodes_checked: List[MazeNode]
-        self.current_nodes_checked_paths: List[int]
+    def __init__(self, maze: Maze, seed: Any = None) -> None:
+        super().__init__(maze, seed)
 
-    def generate_maze(self) -> Maze:
-
-        self.unvisited_nodes = [index for index in range(len(self.maze.maze_body))]
-        self.visited_nodes = []
-        self.current_nodes_checked = []
-        self.current_nodes_checked_paths = []
-
-        self.visited_nodes.append(self.unvisited_nodes.pop(random.randint(0, len(self.unvisited_nodes) - 1)))
-
-        while len(self.unvisited_nodes) > 0:
-            current_node: MazeNode = random.choice(self.unvisited_nodes)
-            self.current_nodes_checked = [current_node]
-            self.current_nodes_checked_paths = ["i"]
-
-            while self.current_nodes_checked[-1] not in self.visited_nodes:
-                random_neighbour = self.get_random_neighbour_index(current_node, self.maze)
-
-                try:
-                    node_pos = self.current_nodes_checked.index(current_node)
-                    self.current_nodes_checked_paths[node_pos] = self.get_direction_from_node(current_node, random_neighbour, self.maze)
-                except ValueError:
-                    self.current_nodes_checked.append(current_node)
-                    self.current_nodes_checked_paths.append(self.get_direction_from_node(current_node, random_neighbour, self.maze))
-                finally:
-                    current_node = random_neighbour
-            
-            current_node = self.current_nodes_checked[0]
-            current_direction = self.current_nodes_checked_paths[0]
-
-            while True:
-
-                if current_node == self.current_nodes_checked[-1]: break
-
-                neighbour_node = self.get_neighbour_based_on_str(current_node, current_direction)
-                self.remove_walls(self.maze[current_node], self.maze[neighbour_node])
-
-                next_index = self.current_nodes_checked.index(neighbour_node)
-
-                self.unvisited_nodes.remove(current_node)
-                self.visited_nodes.append(current_node)
-
-                current_node = self.current_nodes_checked[next_index]
-                current_direction = self.current_nodes_checked_paths[next_index]
-        
-
-
-
-    def get_neighbour_based_on_str(self, node_index: int, direction: str):
-        if direction == "l": return node_index - 1
-        if direction == "r": return node_index + 1
-        if direction == "t": return node_index + self.maze.w
-        if direction == "b": return node_index - self.maze.w
-
-        raise ValueError(f"Invalid value for direction ({direction}).")
+        self.in_tree: bytearray
+        # Position of the direction (in DIRECTIONS) each node's random walk last left it by.
+        # Overwriting it when a walk revisits a node erases the loop the walk just made.
+        self.walk_directions: bytearray
 
+        # Nodes not yet in the tree, with each node's position in the list for O(1) removal.
+        self.unvisited_nodes: List[int]
+        self.unvisited_positions: array
 
+    def generate_maze(self) -> Maze:
+        neighbour_tables = self.maze.neighbour_tables
 
-    def get_random_neighbour_index(self, node_index: int, maze: Maze):
-        neighbours = maze.get_node_neighbours(maze[node_index])
-        random_neighbour = random.choice(neighbours)
-        return random_neighbour.x + (random_neighbour.y * maze.w)
+        self.in_tree = bytearray(self.maze.size)
+        self.walk_directions = bytearray(self.maze.size)
+        self.unvisited_nodes = list(range(self.maze.size))
+        self.unvisited_positions = array("i", range(self.maze.size))
 
-    @staticmethod
-    def get_direction_from_node(node_index: int, other_node_index: int, maze: Maze):
-        if other_node_index - node_index == -1: return "l"
-        if other_node_index - node_index == 1: return "r"
-        if other_node_index - node_index == maze.w: return "t"
-        if other_node_index - node_index == - maze.w: return "b"
+        root_node = self.random.randrange(0, self.maze.size)
+        self.in_tree[root_node] = True
+        self.remove_unvisited_node(root_node)
 
-        raise ValueError(f"other_node_index is not a neighbour to node_index (node_index={node_index}, other_node_index={other_node_index}).")
+        while len(self.unvisited_nodes) > 0:
+            start_node = self.random.choice(self.unvisited_nodes)
+
+            # Random walk until the tree is reached.
+            current_node = start_node
+            while not self.in_tree[current_node]:
+                direction_position = self.get_random_direction_position(current_node, neighbour_tables)
+                self.walk_directions[current_node] = direction_position
+                current_node = neighbour_tables[direction_position][current_node]
+
+            # Add the loop-erased walk to the tree.
+            current_node = start_node
+            while not self.in_tree[current_node]:
+                direction_position = self.walk_directions[current_node]
+                self.maze.carve(current_node, DIRECTIONS[direction_position])
+
+                self.in_tree[current_node] = True
+                self.remove_unvisited_node(current_node)
+                current_node = neighbour_tables[direction_position][current_node]
+
+        return self.maze
+
+
+    def remove_unvisited_node(self, node_index: int):
+        # Swap the node with the last unvisited node so that it can be removed in O(1).
+        position = self.unvisited_positions[node_index]
+        last_node = self.unvisited_nodes[-1]
+
+        self.unvisited_nodes[position] = last_node
+        self.unvisited_positions[last_node] = position
+        self.unvisited_nodes.pop()
+
+    def get_random_direction_position(self, node_index: int, neighbour_tables) -> int:
+        # Picking a random direction and retrying at the border is uniform over the valid neighbours.
+        while True:
+            direction_position = self.random.randrange(0, 4)
+            if neighbour_tables[direction_position][node_index] != -1: return direction_position
@@ -0,0 +1,69 @@
+import struct
+from typing import Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Maze file layout: header followed by the walls of every node.
+# Packed files store two nodes per byte (low nibble = even index, high nibble = odd index).
+MAZE_FILE_MAGIC = b"AAMZ"
+MAZE_FILE_VERSION = 1
+MAZE_FILE_HEADER = struct.Struct("<4sBBIIQQ")
+
+FLAG_PACKED = 0b00000001
+FLAG_START_FILLED = 0b00000010
+
+_HIGH_NIBBLE_TABLE = bytes(((value << 4) & 0xFF) for value in range(256))
+_LOW_NIBBLE_TABLE = bytes((value & 0x0F) for value in range(256))
+_SHIFT_DOWN_TABLE = bytes((value >> 4) for value in range(256))
+
+
+def packed_size(size: int) -> int:
+    return (size + 1) // 2
+
+
+def pack_walls(wall_grid: bytearray) -> bytes:
+    if np is not None:
+        walls = np.frombuffer(wall_grid, dtype=np.uint8)
+        packed = walls[0::2].copy()
+        packed[:len(walls) // 2] |= walls[1::2] << 4
+        return packed.tobytes()
+
+    # Combine the even and odd nodes as two big integers to avoid a Python loop over every node.
+    low_nibbles = bytes(wall_grid[0::2])
+    high_nibbles = bytes(wall_grid[1::2]).translate(_HIGH_NIBBLE_TABLE)
+    packed = int.from_bytes(low_nibbles, "little") | int.from_bytes(high_nibbles, "little")
+    return packed.to_bytes(len(low_nibbles), "little")
+
+
+def unpack_walls(data: bytes, size: int) -> bytearray:
+    if len(data) < packed_size(size): raise ValueError(f"Not enough wall data for {size} nodes.")
+    data = data[:packed_size(size)]
+    wall_grid = bytearray(size)
+
+    if np is not None:
+        packed = np.frombuffer(data, dtype=np.uint8)
+        walls = np.frombuffer(wall_grid, dtype=np.uint8)
+        walls[0::2] = packed & 0x0F
+        walls[1::2] = (packed >> 4)[:size // 2]
+        return wall_grid
+
+    wall_grid[0::2] = data.translate(_LOW_NIBBLE_TABLE)
+    wall_grid[1::2] = data.translate(_SHIFT_DOWN_TABLE)[:size // 2]
+    return wall_grid
+
+
+def encode_header(w: int, h: int, entrance_index: int, exit_index: int, flags: int) -> bytes:
+    return MAZE_FILE_HEADER.pack(MAZE_FILE_MAGIC, MAZE_FILE_VERSION, flags, w, h, entrance_index, exit_index)
+
+
+def decode_header(data: bytes) -> Tuple[int, int, int, int, int]:
+    if len(data) < MAZE_FILE_HEADER.size: raise ValueError("Data is too short to be a maze file.")
+
+    magic, version, flags, w, h, entrance_index, exit_index = MAZE_FILE_HEADER.unpack_from(data)
+    if magic != MAZE_FILE_MAGIC: raise ValueError("Data is not a maze file (invalid header).")
+    if version != MAZE_FILE_VERSION: raise ValueError(f"Unsupported maze file version ({version}).")
+
+    return w, h, entrance_index, exit_index, flags
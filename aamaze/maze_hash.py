@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Zobrist-style hashing of a maze: every (node, wall bit) pair has a 64 bit key, and a maze's hash is the XOR of the
+# keys of all the wall bits that are set, so changing a wall only needs its key XORed in or out.
+# Keys come from the splitmix64 mixing function instead of a random table, so they take no memory and are the same
+# in every process. Low 4 bits of the mixed value say what is being keyed (wall bits 0-7, entrance, exit or size).
+MASK_64 = 2 ** 64 - 1
+
+_ENTRANCE_KEY = 8
+_EXIT_KEY = 9
+_SIZE_KEY = 10
+
+
+def mix64(value: int) -> int:
+    value = (value + 0x9E3779B97F4A7C15) & MASK_64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK_64
+    return value ^ (value >> 31)
+
+
+def get_walls_key(index: int, wall_bits: int) -> int:
+    # XOR of the keys of every bit set in wall_bits for node[index].
+    key = 0
+    bit = 0
+    while wall_bits:
+        if wall_bits & 1: key ^= mix64((index << 4) | bit)
+        wall_bits >>= 1
+        bit += 1
+
+    return key
+
+
+def hash_wall_grid(wall_grid: bytearray) -> int:
+    if np is not None: return _hash_wall_grid_numpy(wall_grid)
+
+    wall_hash = 0
+    for index, walls in enumerate(wall_grid):
+        if walls: wall_hash ^= get_walls_key(index, walls)
+
+    return wall_hash
+
+
+def _hash_wall_grid_numpy(wall_grid: bytearray) -> int:
+    walls = np.frombuffer(wall_grid, dtype=np.uint8)
+    indexes = np.arange(len(walls), dtype=np.uint64) << np.uint64(4)
+
+    wall_hash = np.uint64(0)
+    with np.errstate(over="ignore"):
+        for bit in range(8):
+            keyed_indexes = indexes[(walls & (1 << bit)) != 0] | np.uint64(bit)
+            if keyed_indexes.size: wall_hash ^= np.bitwise_xor.reduce(_mix64_array(keyed_indexes))
+
+    return int(wall_hash)
+
+
+def _mix64_array(values: np.ndarray) -> np.ndarray:
+    # mix64 over a uint64 array (multiplication wraps around at 64 bits, like the masks in mix64).
+    values = values + np.uint64(0x9E3779B97F4A7C15)
+    values = (values ^ (values >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+def get_layout_key(w: int, h: int, entrance_index: int, exit_index: int) -> int:
+    # Key for a maze's size, entrance and exit, XORed with the wall hash to make its fingerprint.
+    return (mix64((((w << 32) | h) << 4) | _SIZE_KEY) ^ mix64((entrance_index << 4) | _ENTRANCE_KEY) ^
+            mix64((exit_index << 4) | _EXIT_KEY))
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from array import array
+from collections import deque
+from typing import List
+
+from aamaze.base_maze import Maze, MazeNode
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class MazeTree:
+    # Index over a perfect maze (one where every pair of nodes is joined by exactly one path, which is what every
+    # GenerationAlgorithm makes) for answering many distance/path queries on the same maze.
+    # The maze is stored as a tree rooted at root_index: each node's parent and depth, plus ancestor tables for
+    # finding the lowest common ancestor of two nodes by binary lifting (ancestors[k][node] is 2**k levels up).
+    # If the maze's walls change, the index is rebuilt on the next query.
+    def __init__(self, maze: Maze, root_index: int = None) -> None:
+        self.maze = maze
+        if root_index is None: root_index = self.maze.get_node_index(self.maze.entrance_node)
+        self.root_index = self._normalise_index(root_index)
+
+        self.parents: array
+        self.depths: array
+        self.ancestors: List[array]
+        self.wall_version: int
+
+        self.build()
+
+
+    def build(self):
+        parents = array("i", [-1]) * self.maze.size
+        depths = array("i", [-1]) * self.maze.size
+        depths[self.root_index] = 0
+
+        unchecked_nodes = deque([self.root_index])
+        while len(unchecked_nodes) > 0:
+            node_index = unchecked_nodes.popleft()
+
+            for neighbour_index in self.maze.open_neighbours(node_index):
+                if neighbour_index == parents[node_index]: continue
+                if depths[neighbour_index] != -1:
+                    raise ValueError(f"Maze is not a perfect maze (node {neighbour_index} can be reached by two paths).")
+
+                parents[neighbour_index] = node_index
+                depths[neighbour_index] = depths[node_index] + 1
+                unchecked_nodes.append(neighbour_index)
+
+        if -1 in depths:
+            raise ValueError(f"Maze is not a perfect maze (node {depths.index(-1)} can't be reached).")
+
+        self.parents = parents
+        self.depths = depths
+        self.ancestors = self.get_ancestor_tables(parents, self.root_index, max(depths))
+        self.wall_version = self.maze.wall_version
+
+    @staticmethod
+    def get_ancestor_tables(parents: array, root_index: int, max_depth: int) -> List[array]:
+        # The root is its own parent here, so jumping past it stays at the root.
+        first_ancestors = array("i", parents)
+        first_ancestors[root_index] = root_index
+        ancestors = [first_ancestors]
+
+        for _ in range(1, max(1, max_depth.bit_length())):
+            previous_ancestors = ancestors[-1]
+            if np is not None:
+                previous_array = np.frombuffer(previous_ancestors, dtype=np.int32)
+                ancestors.append(array("i", previous_array[previous_array].tobytes()))
+            else:
+                ancestors.append(array("i", [previous_ancestors[node] for node in previous_ancestors]))
+
+        return ancestors
+
+
+    def lowest_common_ancestor(self, a: int, b: int) -> int:
+        a, b = self._normalise_index(a), self._normalise_index(b)
+        self._check_up_to_date()
+        if self.depths[a] < self.depths[b]: a, b = b, a
+
+        depth_difference = self.depths[a] - self.depths[b]
+        level = 0
+        while depth_difference:
+            if depth_difference & 1: a = self.ancestors[level][a]
+            depth_difference >>= 1
+            level += 1
+
+        if a == b: return a
+
+        for ancestors in reversed(self.ancestors):
+            if ancestors[a] != ancestors[b]:
+                a = ancestors[a]
+                b = ancestors[b]
+
+        return self.parents[a]
+
+    def distance(self, a: int, b: int) -> int:
+        # Number of steps on the path between node[a] and node[b], in O(log n).
+        common_ancestor = self.lowest_common_ancestor(a, b)
+        return self.depths[a] + self.depths[b] - (2 * self.depths[common_ancestor])
+
+    def path_indexes(self, a: int, b: int) -> List[int]:
+        common_ancestor = self.lowest_common_ancestor(a, b)
+        a, b = a % self.maze.size, b % self.maze.size
+
+        path = []
+        while a != common_ancestor:
+            path.append(a)
+            a = self.parents[a]
+        path.append(common_ancestor)
+
+        other_half = []
+        while b != common_ancestor:
+            other_half.append(b)
+            b = self.parents[b]
+
+        path.extend(reversed(other_half))
+        return path
+
+    def path(self, a: int, b: int) -> List[MazeNode]:
+        # Nodes on the path from node[a] to node[b] (both included), in O(path length).
+        return [self.maze[node_index] for node_index in self.path_indexes(a, b)]
+
+
+    def _normalise_index(self, index: int) -> int:
+        # Negative indexes count back from the end, as they do for Maze[...].
+        if not -self.maze.size <= index < self.maze.size:
+            raise IndexError(f"Node index {index} is out of range for a maze of {self.maze.size} nodes.")
+        return index % self.maze.size
+
+    def _check_up_to_date(self):
+        if self.wall_version != self.maze.wall_version: self.build()
@@ -1,3 +1,7 @@
 from .a_star import AStarSolver
+from .bidirectional import BidirectionalSolver
+from .dead_end_fill import DeadEndFillSolver
 from .dijkstra import DijkstraSolver
 from .flood_fill import FloodFillSolutionCheck
+from .lpa_star import LPAStarSolver
+from .solution_cache import SolutionCache
@@ -1,42 +1,49 @@
 from __future__ import annotations
 
-from typing import List
+import heapq
+from array import array
+from typing import List, Tuple
 
-from aamaze.base_maze import Maze, MazeNode, SolvingAlgorithm
+from aamaze.base_maze import UNREACHED, Maze, MazeNode, SolvingAlgorithm
 
 
 class AStarSolver(SolvingAlgorithm):
     def __init__(self, maze: Maze) -> None:
-        self.maze = maze
+        super().__init__(maze)
 
-        self.path_nodes: List[PathNode]
-        self.open_nodes: List[PathNode]
-        self.closed_nodes: List[PathNode]
+        # Per-node search state, indexed by node index.
+        self.g_values: array
+        self.previous_nodes: array
+        self.closed_status: bytearray
 
-        self.current_node: PathNode
-        self.start_node_index = self.maze.entrance_node.x + (self.maze.entrance_node.y * self.maze.w)
-        self.target_node_index = self.maze.exit_node.x + (self.maze.exit_node.y * self.maze.w)
-        self.target_node: PathNode
+        # Heap of (f value, h value, node index). Entries made stale by a better path are skipped when popped.
+        self.open_heap: List[Tuple[int, int, int]]
+        self.closed_nodes: List[int]
+
+        self.current_node_index: int
+        self.start_node_index = self.maze.get_node_index(self.maze.entrance_node)
+        self.target_node_index = self.maze.get_node_index(self.maze.exit_node)
 
         self.setup_data_structures()
 
-    
-    def setup_data_structures(self):
-        self.path_nodes = self.get_open_nodes_list()
 
-        self.current_node = self.path_nodes[self.start_node_index]
-        self.path_nodes[self.start_node_index].g_value = 0
+    def setup_data_structures(self):
+        self.g_values = array("i", [UNREACHED]) * self.maze.size
+        self.previous_nodes = array("i", [-1]) * self.maze.size
+        self.closed_status = bytearray(self.maze.size)
 
-        self.open_nodes = [self.current_node]
+        self.g_values[self.start_node_index] = 0
+        start_h_value = self.calculate_h_value(self.start_node_index)
+        self.open_heap = [(start_h_value, start_h_value, self.start_node_index)]
         self.closed_nodes = []
+
+        self.current_node_index = -1
         self.solution = []
         self.step_counter = 0
         self.solved = False
 
-        self.target_node = self.path_nodes[self.target_node_index]
-
     def solve_maze(self) -> List[MazeNode]:
-        while not self.solved and len(self.open_nodes) > 0:
+        while not self.solved and len(self.open_heap) > 0:
             self.step()
 
         return self.solution
@@ -44,91 +51,59 @@ class AStarSolver(SolvingAlgorithm):
     def step(self):
         if self.solved: return
         self.step_counter += 1
-        
-        self.current_node = self.get_lowest_f_value_node()
 
-        if self.current_node is None:
+        self.current_node_index = self.pop_lowest_f_value_node()
+
+        if self.current_node_index == -1:
             self._set_solved()
             return
 
-        self.open_nodes.remove(self.current_node)
-        self.closed_nodes.append(self.current_node)
+        self.closed_status[self.current_node_index] = True
+        self.closed_nodes.append(self.current_node_index)
 
-        if self.maze.get_node_index(self.current_node.node) == self.target_node_index:
+        if self.current_node_index == self.target_node_index:
             self._set_solved()
             return
-    
-        neighbours = [self.get_path_node(maze_node) for maze_node in self.maze.get_node_neighbours(self.current_node.node)]
 
-        for neighbour in neighbours:
-            if neighbour.f_value <= self.current_node.f_value: continue
-            if self.maze.check_nodes_seperated_by_wall(self.current_node.node, neighbour.node): continue
-            if neighbour in self.closed_nodes: continue
+        g_value = self.g_values[self.current_node_index] + 1
+        for neighbour_index in self.maze.open_neighbours(self.current_node_index):
+            if self.closed_status[neighbour_index]: continue
+            if g_value >= self.g_values[neighbour_index]: continue
+
+            self.g_values[neighbour_index] = g_value
+            self.previous_nodes[neighbour_index] = self.current_node_index
 
-            neighbour.g_value = self.calculate_g_value(self.current_node)
-            neighbour.previous_node = self.current_node
+            h_value = self.calculate_h_value(neighbour_index)
+            heapq.heappush(self.open_heap, (g_value + h_value, h_value, neighbour_index))
 
-            if neighbour not in self.closed_nodes: self.open_nodes.append(neighbour)
-  
     def get_incomplete_solution_nodes(self) -> List[MazeNode]:
-        return [path_node.node for path_node in self.closed_nodes]
+        return [self.maze[node_index] for node_index in self.closed_nodes]
 
 
     def _set_solved(self) -> bool:
-        if self.current_node is None:
+        if self.current_node_index != self.target_node_index:
             self.solved = False
-            return []
+            return self.solved
 
-        if self.maze.get_node_index(self.current_node.node) == self.target_node_index:
-            self.solved = True
+        self.solved = True
 
-        solution_node = self.target_node
-        while solution_node is not None:
-            self.solution.append(solution_node.node)
-            solution_node = solution_node.previous_node
-        
+        node_index = self.target_node_index
+        while node_index != -1:
+            self.solution.append(self.maze[node_index])
+            node_index = self.previous_nodes[node_index]
 
         self.solution.reverse()
         return self.solved
-        
-
-    def get_path_node(self, maze_node: MazeNode) -> PathNode:
-        for path_node in self.path_nodes:
-            if path_node.node == maze_node: return path_node
-
-    def get_open_nodes_list(self):
-        return [PathNode(self.maze[node_index], None, 999999, self.calculate_h_value(node_index)) for node_index in range(self.maze.size)]
-    
-    def get_lowest_f_value_node(self) -> PathNode:
-        l_value = 99999999
-        l_node: PathNode = None
-        for path_node in self.open_nodes:
-            if path_node.f_value < l_value:
-                l_value = path_node.f_value
-                l_node = path_node
-        
-        return l_node
+
+
+    def pop_lowest_f_value_node(self) -> int:
+        # Returns -1 once the open set is empty.
+        while len(self.open_heap) > 0:
+            node_index = heapq.heappop(self.open_heap)[2]
+            if not self.closed_status[node_index]: return node_index
+
+        return -1
 
     def calculate_h_value(self, node_index: int):
         return (abs((self.target_node_index % self.maze.w) - node_index % self.maze.w) +
          abs((self.target_node_index // self.maze.w) - node_index // self.maze.w))
-    
-    def calculate_g_value(self, previous_node: PathNode):
-        return previous_node.g_value + 1
-
-
-class PathNode:
-    def __init__(self, node: MazeNode, previous_node: MazeNode, g_value: int = 0,
-     h_value: int = 0) -> None:
-        self.node = node
-        self.previous_node = previous_node
-
-        self.g_value: int = g_value
-        self.h_value: int = h_value
-
-    @property
-    def f_value(self) -> int:
-        return self.g_value + self.h_value
-    
-    def __repr__(self) -> str:
-        return f"PathNode(node={self.node}, previous_node={self.previous_node}, f_value={self.f_value}, g_value={self.g_value}, h_value={self.h_value})"
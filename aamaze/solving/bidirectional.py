@@ -0,0 +1,130 @@
+from array import array
+from collections import deque
+from typing import Deque, List
+
+from aamaze.base_maze import UNREACHED, Maze, MazeNode, SolvingAlgorithm
+
+
+class BidirectionalSolver(SolvingAlgorithm):
+    def __init__(self, maze: Maze) -> None:
+        super().__init__(maze)
+
+        self.start_node_index = self.maze.get_node_index(self.maze.entrance_node)
+        self.target_node_index = self.maze.get_node_index(self.maze.exit_node)
+
+        # Breadth first searches from the entrance (forward) and from the exit (backward).
+        self.forward_queue: Deque[int]
+        self.backward_queue: Deque[int]
+        self.forward_distances: array
+        self.backward_distances: array
+        self.forward_previous_nodes: array
+        self.backward_previous_nodes: array
+
+        # Shortest path found so far: its length in edges, and the edge where the two searches met.
+        self.best_path_length: int
+        self.meeting_nodes: List[int]
+
+        self.expanded_nodes: List[MazeNode]
+        self.setup_data_structures()
+
+
+    def setup_data_structures(self):
+        self.forward_queue = deque([self.start_node_index])
+        self.backward_queue = deque([self.target_node_index])
+        self.forward_distances = array("i", [UNREACHED]) * self.maze.size
+        self.backward_distances = array("i", [UNREACHED]) * self.maze.size
+        self.forward_previous_nodes = array("i", [-1]) * self.maze.size
+        self.backward_previous_nodes = array("i", [-1]) * self.maze.size
+
+        self.forward_distances[self.start_node_index] = 0
+        self.backward_distances[self.target_node_index] = 0
+
+        self.best_path_length = UNREACHED
+        self.meeting_nodes = []
+        if self.start_node_index == self.target_node_index:
+            self.best_path_length = 0
+            self.meeting_nodes = [self.start_node_index, self.target_node_index]
+
+        self.expanded_nodes = []
+        self.solution = []
+        self.step_counter = 0
+        self.solved = False
+
+    def solve_maze(self) -> List[MazeNode]:
+        while not self.solved and (len(self.forward_queue) > 0 or len(self.backward_queue) > 0):
+            self.step()
+
+        return self.solution
+
+    def step(self):
+        if self.solved: return
+        self.step_counter += 1
+
+        # Stop once no unexpanded pair of nodes can make a shorter path than the best one found,
+        # or when one search has run out of nodes (the other end can't be reached).
+        if self._search_finished():
+            self._set_solved()
+            self.forward_queue.clear()
+            self.backward_queue.clear()
+            return
+
+        # Expand the side with the smaller frontier, taking turns while they are the same size.
+        forward_size, backward_size = len(self.forward_queue), len(self.backward_queue)
+        if forward_size < backward_size or (forward_size == backward_size and self.step_counter % 2):
+            self._expand(self.forward_queue, self.forward_distances, self.forward_previous_nodes,
+                          self.backward_distances, False)
+        else:
+            self._expand(self.backward_queue, self.backward_distances, self.backward_previous_nodes,
+                          self.forward_distances, True)
+
+    def get_incomplete_solution_nodes(self) -> List[MazeNode]:
+        return self.expanded_nodes
+
+
+    def _expand(self, queue: Deque[int], distances: array, previous_nodes: array, other_distances: array,
+                 backward: bool):
+        node_index = queue.popleft()
+        self.expanded_nodes.append(self.maze[node_index])
+
+        new_distance = distances[node_index] + 1
+        for neighbour_index in self.maze.open_neighbours(node_index):
+            if other_distances[neighbour_index] != UNREACHED:
+                path_length = new_distance + other_distances[neighbour_index]
+                if path_length < self.best_path_length:
+                    self.best_path_length = path_length
+                    if backward: self.meeting_nodes = [neighbour_index, node_index]
+                    else: self.meeting_nodes = [node_index, neighbour_index]
+
+            if distances[neighbour_index] != UNREACHED: continue
+            distances[neighbour_index] = new_distance
+            previous_nodes[neighbour_index] = node_index
+            queue.append(neighbour_index)
+
+    def _search_finished(self) -> bool:
+        if len(self.meeting_nodes) == 0: return len(self.forward_queue) == 0 or len(self.backward_queue) == 0
+        if len(self.forward_queue) == 0 or len(self.backward_queue) == 0: return True
+
+        return (self.forward_distances[self.forward_queue[0]] +
+                 self.backward_distances[self.backward_queue[0]] >= self.best_path_length)
+
+    def _set_solved(self) -> bool:
+        if len(self.meeting_nodes) == 0:
+            self.solved = False
+            return self.solved
+
+        forward_meeting_node, backward_meeting_node = self.meeting_nodes
+
+        node_index = forward_meeting_node
+        while node_index != -1:
+            self.solution.append(self.maze[node_index])
+            node_index = self.forward_previous_nodes[node_index]
+        self.solution.reverse()
+
+        node_index = backward_meeting_node
+        if backward_meeting_node == forward_meeting_node: node_index = self.backward_previous_nodes[node_index]
+        while node_index != -1:
+            self.solution.append(self.maze[node_index])
+            node_index = self.backward_previous_nodes[node_index]
+
+        self.solved = True
+        return self.solved
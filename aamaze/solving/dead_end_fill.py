@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+from array import array
+from collections import deque
+from typing import Deque, List
+
+from aamaze.base_maze import (BOTTOM_WALL, LEFT_WALL, RIGHT_WALL, TOP_WALL,
+                              Maze, MazeNode, SolvingAlgorithm, require_numpy)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# solve_maze_vectorised switches to filling one node at a time once a pass would fill fewer nodes than this, as the
+# cost of a numpy pass is then mostly overhead (long corridors leave only a few dead ends to fill in each pass).
+MIN_VECTORISED_PASS_SIZE = 64
+
+
+class DeadEndFillSolver(SolvingAlgorithm):
+    def __init__(self, maze: Maze) -> None:
+        super().__init__(maze)
+
+        self.start_node_index = self.maze.get_node_index(self.maze.entrance_node)
+        self.target_node_index = self.maze.get_node_index(self.maze.exit_node)
+
+        # Number of open neighbours of each node that haven't been filled yet.
+        self.degrees: array
+        self.filled_status: bytearray
+        self.filled_nodes: array    # Node indexes in the order they were filled.
+        # Dead ends waiting to be filled. The entrance and exit are never filled.
+        # None until the first step, so solve_maze_vectorised doesn't pay for setting up the stepping state.
+        self.pruning_queue: Deque[int]
+
+        self.setup_data_structures()
+
+
+    def setup_data_structures(self):
+        self.degrees = None
+        self.filled_status = bytearray(self.maze.size)
+        self.filled_nodes = array("i")
+        self.pruning_queue = None
+
+        self.solution = []
+        self.step_counter = 0
+        self.solved = False
+
+    def setup_pruning_queue(self):
+        if np is not None:
+            degrees = np.sum(self._get_open_masks(), axis=0, dtype=np.int32)
+            dead_ends = (degrees <= 1)
+            dead_ends[[self.start_node_index, self.target_node_index]] = False
+
+            self.degrees = array("i", degrees.tobytes())
+            self.pruning_queue = deque(np.flatnonzero(dead_ends).tolist())
+            return
+
+        self.degrees = array("i", [0]) * self.maze.size
+        self.pruning_queue = deque()
+        for node_index in range(self.maze.size):
+            degree = sum(1 for _ in self.maze.open_neighbours(node_index))
+            self.degrees[node_index] = degree
+            if degree <= 1 and not self._is_end(node_index): self.pruning_queue.append(node_index)
+
+    def solve_maze(self) -> List[MazeNode]:
+        if self.pruning_queue is None: self.setup_pruning_queue()
+        while len(self.pruning_queue) > 0 and not self.solved:
+            self.step()
+
+        if not self.solved: self._set_solved()
+        return self.solution
+
+    def step(self):
+        if self.solved: return
+        self.step_counter += 1
+
+        if self.pruning_queue is None: self.setup_pruning_queue()
+        if len(self.pruning_queue) == 0:
+            self._set_solved()
+            return
+
+        node_index = self.pruning_queue.popleft()
+        self.filled_status[node_index] = True
+        self.filled_nodes.append(node_index)
+
+        for neighbour_index in self.maze.open_neighbours(node_index):
+            if self.filled_status[neighbour_index]: continue
+
+            self.degrees[neighbour_index] -= 1
+            if self.degrees[neighbour_index] == 1 and not self._is_end(neighbour_index):
+                self.pruning_queue.append(neighbour_index)
+
+        if len(self.pruning_queue) == 0:
+            self._set_solved()
+            return
+
+    def get_incomplete_solution_nodes(self) -> List[MazeNode]:
+        return [self.maze[node_index] for node_index in self.filled_nodes]
+
+
+    def solve_maze_vectorised(self) -> List[MazeNode]:
+        # Bulk mode (requires numpy): fills every current dead end of the maze at once, then the nodes they leave
+        # as new dead ends, until none are left. Each pass only touches the nodes filled in it and their neighbours.
+        # Once the passes get small, the remaining dead ends are filled by stepping (as solve_maze does).
+        require_numpy()
+        self.filled_nodes = array("i")
+        self.solution = []
+        self.step_counter = 0
+        self.solved = False
+
+        open_masks = self._get_open_masks()
+        offsets = (self.maze.w, -self.maze.w, -1, 1)
+
+        degrees = np.sum(open_masks, axis=0, dtype=np.int32)
+        unfillable = np.zeros(self.maze.size, dtype=bool)
+        unfillable[[self.start_node_index, self.target_node_index]] = True
+        filled = np.zeros(self.maze.size, dtype=bool)
+
+        dead_ends = np.flatnonzero((degrees <= 1) & ~unfillable)
+        while dead_ends.size >= MIN_VECTORISED_PASS_SIZE:
+            self.step_counter += 1
+            filled[dead_ends] = True
+            self.filled_nodes.extend(dead_ends.tolist())
+
+            neighbours = np.concatenate([dead_ends[open_mask[dead_ends]] + offset
+                                         for open_mask, offset in zip(open_masks, offsets)])
+            neighbours = neighbours[~filled[neighbours]]
+            np.subtract.at(degrees, neighbours, 1)
+
+            neighbours = np.unique(neighbours)
+            dead_ends = neighbours[(degrees[neighbours] <= 1) & ~unfillable[neighbours]]
+
+        self.filled_status = bytearray(filled.view(np.uint8).tobytes())
+        self.degrees = array("i", degrees.tobytes())
+        self.pruning_queue = deque(dead_ends.tolist())
+
+        while len(self.pruning_queue) > 0 and not self.solved:
+            self.step()
+
+        if not self.solved: self._set_solved()
+        return self.solution
+
+
+    def _set_solved(self) -> bool:
+        # Once every dead end is filled, only the path (and any loops on it) is left. In a perfect maze that is
+        # exactly the solution; otherwise a breadth first search over what is left finds the shortest path.
+        self.solution = []
+        self.solved = False
+
+        previous_nodes = {self.start_node_index: -1}
+        unchecked_nodes = deque([self.start_node_index])
+        while len(unchecked_nodes) > 0 and self.target_node_index not in previous_nodes:
+            node_index = unchecked_nodes.popleft()
+
+            for neighbour_index in self.maze.open_neighbours(node_index):
+                if self.filled_status[neighbour_index] or neighbour_index in previous_nodes: continue
+                previous_nodes[neighbour_index] = node_index
+                unchecked_nodes.append(neighbour_index)
+
+        if self.target_node_index not in previous_nodes: return self.solved
+
+        node_index = self.target_node_index
+        while node_index != -1:
+            self.solution.append(self.maze[node_index])
+            node_index = previous_nodes[node_index]
+        self.solution.reverse()
+
+        self.solved = True
+        return self.solved
+
+    def _get_open_masks(self) -> List[np.ndarray]:
+        # Flat bool arrays (top, bottom, left, right) of the sides of each node open to another node.
+        walls = self.maze.wall_array
+        open_masks = [(walls & direction) == 0 for direction in (TOP_WALL, BOTTOM_WALL, LEFT_WALL, RIGHT_WALL)]
+        open_masks[0][-1, :] = False
+        open_masks[1][0, :] = False
+        open_masks[2][:, 0] = False
+        open_masks[3][:, -1] = False
+        return [open_mask.ravel() for open_mask in open_masks]
+
+    def _is_end(self, node_index: int) -> bool:
+        return node_index == self.start_node_index or node_index == self.target_node_index
@@ -1,7 +1,8 @@
-import random
-from typing import Dict, List
+from array import array
+from collections import deque
+from typing import Deque, List
 
-from aamaze.base_maze import Maze, MazeNode, SolvingAlgorithm
+from aamaze.base_maze import UNREACHED, Maze, MazeNode, SolvingAlgorithm
 
 
 class DijkstraSolver(SolvingAlgorithm):
@@ -11,20 +12,28 @@ class DijkstraSolver(SolvingAlgorithm):
         self.target_node_index: int
         self.current_node_index: int
 
-        self.unvisited_nodes: List[int]
-        self.visit_statuses: Dict[int, bool]
-        self.node_paths: List[List[MazeNode]]
+        # Every edge costs 1, so a FIFO queue hands out nodes in order of distance (no heap needed).
+        self.node_queue: Deque[int]
+        self.distances: array
+        self.previous_nodes: array
+        self.visit_status: bytearray
+        self.visited_nodes: List[MazeNode]
         self.setup_data_structures()
 
     
     def setup_data_structures(self):
-        self.unvisited_nodes = [index for index in range(0, self.maze.size)]
-        self.visit_statuses = {key: False for key in range(0, self.maze.size)}
-        self.node_paths = [[] for _ in range(0, self.maze.size)]
+        self.target_node_index = self.maze.get_node_index(self.maze.exit_node)
+        self.current_node_index = self.maze.get_node_index(self.maze.entrance_node)
+
+        self.node_queue = deque()
+        self.distances = array("i", [UNREACHED]) * self.maze.size
+        self.previous_nodes = array("i", [-1]) * self.maze.size
+        self.visit_status = bytearray(self.maze.size)
+        self.visited_nodes = []
+
+        self.distances[self.current_node_index] = 0
         self.solution = []
         self.step_counter = 0
-        self.target_node_index = self.maze.exit_node.x + (self.maze.exit_node.y * self.maze.w)
-        self.current_node_index = self.maze.entrance_node.x + (self.maze.entrance_node.y * self.maze.w)
         self.solved = False
 
     def solve_maze(self) -> List[MazeNode]:
@@ -43,47 +52,39 @@ class DijkstraSolver(SolvingAlgorithm):
             self._set_solved()
             return
 
-        current_node = self.maze[self.current_node_index]
-        current_node_neighbours = self.maze.get_node_neighbours(current_node)
-
-        for neighbour in current_node_neighbours:
-            if self.maze.check_nodes_seperated_by_wall(current_node, neighbour): continue
-
-            neighbour_index = self.maze.get_node_index(neighbour)
-            if self.visit_statuses[neighbour_index]: continue
+        new_distance = self.distances[self.current_node_index] + 1
+        for neighbour_index in self.maze.open_neighbours(self.current_node_index):
+            if self.distances[neighbour_index] != UNREACHED: continue
 
-            new_distance = len(self.node_paths[self.current_node_index]) + 1
-            if new_distance < len(self.node_paths[neighbour_index]) or len(self.node_paths[neighbour_index]) == 0: 
-                self.node_paths[neighbour_index] = self.node_paths[self.current_node_index] + [self.maze[self.current_node_index]]
+            self.distances[neighbour_index] = new_distance
+            self.previous_nodes[neighbour_index] = self.current_node_index
+            self.node_queue.append(neighbour_index)
         
-        self.visit_statuses[self.current_node_index] = True
-        self.unvisited_nodes.remove(self.current_node_index)
+        self._mark_visited(self.current_node_index)
 
-        self.current_node_index = self.get_nearest_node_index()
+        self.current_node_index = self.node_queue.popleft() if len(self.node_queue) > 0 else -1
 
 
     def _set_solved(self) -> bool:
         if self.current_node_index != self.target_node_index:
-            self.visit_statuses[self.current_node_index] = False
             self.solved = False
             return self.solved
 
-        self.visit_statuses[self.current_node_index] = True
-        self.node_paths[self.current_node_index] = self.node_paths[self.current_node_index] + [self.maze[self.current_node_index]]
-        self.solution = self.node_paths[self.current_node_index]
+        self._mark_visited(self.current_node_index)
+
+        # Rebuild the path by following the previous nodes back from the target.
+        node_index = self.target_node_index
+        while node_index != -1:
+            self.solution.append(self.maze[node_index])
+            node_index = self.previous_nodes[node_index]
+        self.solution.reverse()
+
         self.solved = True
         return self.solved
 
+    def _mark_visited(self, node_index: int):
+        self.visit_status[node_index] = True
+        self.visited_nodes.append(self.maze[node_index])
+
     def get_incomplete_solution_nodes(self) -> List[MazeNode]:
-        node_indexes = [key for key in self.visit_statuses.keys() if self.visit_statuses[key]]
-        return [self.maze[node_index] for node_index in node_indexes]
-
-    def get_nearest_node_index(self):
-        shortest_distance = 9999999
-        nearest_index = -1
-        for node_index in self.unvisited_nodes:
-            if len(self.node_paths[node_index]) < shortest_distance and len(self.node_paths[node_index]) > 0:
-                nearest_index = node_index
-                shortest_distance = len(self.node_paths[node_index])
-        
-        return nearest_index
+        return self.visited_nodes
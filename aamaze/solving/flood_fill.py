@@ -1,7 +1,8 @@
-from typing import List, Set
+from array import array
+from collections import deque
+from typing import Deque, List
 
-from aamaze.base_maze import (BOTTOM_WALL, LEFT_WALL, RIGHT_WALL, TOP_WALL,
-                              Maze, MazeNode, SolvingAlgorithm)
+from aamaze.base_maze import DIRECTIONS, Maze, MazeNode, SolvingAlgorithm
 
 
 class FloodFillSolutionCheck(SolvingAlgorithm):
@@ -11,21 +12,29 @@ class FloodFillSolutionCheck(SolvingAlgorithm):
         self.fill_percent: float  # Value between 0 and 1 depending on how many nodes were visited in the maze.
         # Maze is solved if all nodes in the maze were visited else False
 
-        self.visited_nodes: Set[MazeNode]
-        self.unchecked_nodes: List[MazeNode]
+        self.visit_status: bytearray
+        self.visited_nodes: array   # Node indexes in the order they were visited.
+        self.unchecked_nodes: Deque[int]
+
+        # Set by label_components (component label of every node, and the number of nodes in each component).
+        self.component_labels: array = None
+        self.component_sizes: List[int] = None
+
         self.setup_data_structures()
 
-    
+
     def setup_data_structures(self):
-        self.visited_nodes = set()
-        self.unchecked_nodes = []
+        self.visit_status = bytearray(self.maze.size)
+        self.visited_nodes = array("i")
+        self.unchecked_nodes = deque()
         self.solution = []
         self.step_counter = 0
         self.fill_percent = 0
-        self.sovled = False
+        self.solved = False
 
-        self.unchecked_nodes.append(self.maze.get_node_from_coordinates(0, 0))
-        self.visited_nodes.add(self.unchecked_nodes[0])
+        self.unchecked_nodes.append(0)
+        self.visit_status[0] = True
+        self.visited_nodes.append(0)
 
 
     def solve_maze(self) -> List[MazeNode]:
@@ -39,18 +48,16 @@ class FloodFillSolutionCheck(SolvingAlgorithm):
         if len(self.unchecked_nodes) == 0: return
         self.step_counter += 1
 
-        
-        current_node = self.unchecked_nodes.pop(0)
-        neighbours = self.maze.get_neighbours_from_coordinates(current_node.x, current_node.y)
+        current_node = self.unchecked_nodes.popleft()
 
-        for neighbour_node in neighbours:
-            if {neighbour_node}.issubset(self.visited_nodes): continue
-            if self.maze.check_nodes_seperated_by_wall(current_node, neighbour_node): continue
+        for neighbour_index in self.maze.open_neighbours(current_node):
+            if self.visit_status[neighbour_index]: continue
 
-            self.visited_nodes.add(neighbour_node)
-            self.unchecked_nodes.append(neighbour_node)
+            self.visit_status[neighbour_index] = True
+            self.visited_nodes.append(neighbour_index)
+            self.unchecked_nodes.append(neighbour_index)
 
-        if len(self.unchecked_nodes) == 0: 
+        if len(self.unchecked_nodes) == 0:
             self._set_solved()
             return
 
@@ -59,9 +66,46 @@ class FloodFillSolutionCheck(SolvingAlgorithm):
         if len(self.visited_nodes) == self.maze.size: self.solved = True
         else: self.solved = False
 
-        self.solution = list(self.visited_nodes)
+        self.solution = self.get_incomplete_solution_nodes()
 
         return self.solved
 
     def get_incomplete_solution_nodes(self) -> List[MazeNode]:
-        return list(self.visited_nodes)
+        return [self.maze[node_index] for node_index in self.visited_nodes]
+
+
+    def label_components(self) -> List[int]:
+        # Batch mode: labels every connected component of the maze in one pass (without stepping) and returns
+        # the number of nodes in each one. The maze is fully connected if exactly one size is returned.
+        neighbour_tables = list(zip(DIRECTIONS, self.maze.neighbour_tables))
+        wall_grid = self.maze.wall_grid
+
+        labels = array("i", [-1]) * self.maze.size
+        sizes: List[int] = []
+
+        for start_node in range(self.maze.size):
+            if labels[start_node] != -1: continue
+
+            label = len(sizes)
+            labels[start_node] = label
+            component_size = 1
+            unchecked_nodes = deque([start_node])
+
+            while unchecked_nodes:
+                node_index = unchecked_nodes.popleft()
+                walls = wall_grid[node_index]
+
+                for direction, table in neighbour_tables:
+                    if walls & direction: continue
+                    neighbour_index = table[node_index]
+                    if neighbour_index == -1 or labels[neighbour_index] != -1: continue
+
+                    labels[neighbour_index] = label
+                    component_size += 1
+                    unchecked_nodes.append(neighbour_index)
+
+            sizes.append(component_size)
+
+        self.component_labels = labels
+        self.component_sizes = sizes
+        return sizes
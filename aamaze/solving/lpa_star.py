@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import heapq
+from array import array
+from typing import List, Sequence, Tuple
+
+from aamaze.base_maze import (DIRECTIONS, OPPOSITE_WALLS, UNREACHED, Maze,
+                              MazeNode, SolvingAlgorithm)
+
+
+class LPAStarSolver(SolvingAlgorithm):
+    # Lifelong Planning A*: an A* search that is kept up to date as the maze's walls change.
+    # The solver listens for wall edits made through the Maze API. When walls change, only the nodes whose distance
+    # from the entrance is affected are searched again by the next solve_maze (or step) call.
+    # Call detach() to stop listening once the solver is no longer needed.
+    def __init__(self, maze: Maze) -> None:
+        super().__init__(maze)
+
+        self.start_node_index = self.maze.get_node_index(self.maze.entrance_node)
+        self.target_node_index = self.maze.get_node_index(self.maze.exit_node)
+
+        # g_values are the settled distances from the entrance, rhs_values the distances implied by each node's
+        # neighbours. Nodes where the two differ are "inconsistent" and wait in the open heap to be expanded.
+        self.g_values: array
+        self.rhs_values: array
+
+        # Heap of (key, tiebreak key, node index). Entries whose key is out of date are skipped when popped.
+        self.open_heap: List[Tuple[int, int, int]]
+        self.expanded_nodes: List[int]  # Nodes expanded since the search was last (re)started.
+
+        self.setup_data_structures()
+        self.maze.add_wall_listener(self.on_walls_changed)
+
+
+    def setup_data_structures(self):
+        self.g_values = array("i", [UNREACHED]) * self.maze.size
+        self.rhs_values = array("i", [UNREACHED]) * self.maze.size
+        self.rhs_values[self.start_node_index] = 0
+
+        self.open_heap = []
+        self.push_node(self.start_node_index)
+        self.expanded_nodes = []
+
+        self.solution = []
+        self.step_counter = 0
+        self.solved = False
+
+    def detach(self):
+        self.maze.remove_wall_listener(self.on_walls_changed)
+
+    def solve_maze(self) -> List[MazeNode]:
+        while not self.solved and not self._search_finished():
+            self.step()
+
+        if not self.solved: self._set_solved()
+        return self.solution
+
+    def step(self):
+        if self.solved: return
+        self.step_counter += 1
+
+        if self._search_finished():
+            self._set_solved()
+            return
+
+        node_index = heapq.heappop(self.open_heap)[2]
+        self.expanded_nodes.append(node_index)
+
+        if self.g_values[node_index] > self.rhs_values[node_index]:
+            # Distance has gone down (or been found for the first time): settle it.
+            self.g_values[node_index] = self.rhs_values[node_index]
+        else:
+            # Distance has gone up: forget it, and work it out again from the neighbours.
+            self.g_values[node_index] = UNREACHED
+            self.update_node(node_index)
+
+        for neighbour_index in self.maze.open_neighbours(node_index):
+            self.update_node(neighbour_index)
+
+    def get_incomplete_solution_nodes(self) -> List[MazeNode]:
+        return [self.maze[node_index] for node_index in self.expanded_nodes]
+
+
+    def on_walls_changed(self, indexes: Sequence[int]):
+        # Edges next to the changed nodes may have opened or closed, so the nodes on both sides are re-evaluated.
+        changed_nodes = set(indexes)
+        for node_index in indexes: changed_nodes.update(self.maze.neighbour_indexes(node_index))
+
+        for node_index in changed_nodes: self.update_node(node_index)
+
+        self.expanded_nodes = []
+        self.solution = []
+        self.solved = False
+
+    def update_node(self, node_index: int):
+        if node_index != self.start_node_index:
+            rhs_value = UNREACHED
+            for previous_index in self.get_previous_nodes(node_index):
+                g_value = self.g_values[previous_index]
+                if g_value < rhs_value - 1: rhs_value = g_value + 1
+            self.rhs_values[node_index] = rhs_value
+
+        if self.g_values[node_index] != self.rhs_values[node_index]: self.push_node(node_index)
+
+    def get_previous_nodes(self, node_index: int) -> List[int]:
+        # Neighbours with an opening towards node[node_index].
+        previous_nodes = []
+        for direction, table in zip(DIRECTIONS, self.maze.neighbour_tables):
+            previous_index = table[node_index]
+            if previous_index == -1 or self.maze.wall_grid[previous_index] & OPPOSITE_WALLS[direction]: continue
+            previous_nodes.append(previous_index)
+
+        return previous_nodes
+
+    def push_node(self, node_index: int):
+        heapq.heappush(self.open_heap, (*self.calculate_key(node_index), node_index))
+
+    def calculate_key(self, node_index: int) -> Tuple[int, int]:
+        distance = min(self.g_values[node_index], self.rhs_values[node_index])
+        return (distance + self.calculate_h_value(node_index), distance)
+
+    def calculate_h_value(self, node_index: int):
+        return (abs((self.target_node_index % self.maze.w) - node_index % self.maze.w) +
+         abs((self.target_node_index // self.maze.w) - node_index // self.maze.w))
+
+
+    def _search_finished(self) -> bool:
+        # Drops out of date heap entries, then checks whether any remaining node could still change the exit's
+        # distance.
+        while len(self.open_heap) > 0:
+            key, tiebreak_key, node_index = self.open_heap[0]
+            if (self.g_values[node_index] != self.rhs_values[node_index] and
+                 (key, tiebreak_key) == self.calculate_key(node_index)): break
+            heapq.heappop(self.open_heap)
+
+        if len(self.open_heap) == 0: return True
+        if self.g_values[self.target_node_index] != self.rhs_values[self.target_node_index]: return False
+        return self.open_heap[0][:2] >= self.calculate_key(self.target_node_index)
+
+    def _set_solved(self) -> bool:
+        self.solution = []
+        if self.g_values[self.target_node_index] == UNREACHED:
+            self.solved = False
+            return self.solved
+
+        # Walk back from the exit, always to the neighbour closest to the entrance.
+        node_index = self.target_node_index
+        self.solution.append(self.maze[node_index])
+        while node_index != self.start_node_index:
+            node_index = min(self.get_previous_nodes(node_index), key=self.g_values.__getitem__)
+            self.solution.append(self.maze[node_index])
+
+        self.solution.reverse()
+        self.solved = True
+        return self.solved
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import os
+import struct
+from collections import OrderedDict
+from typing import List, Optional, Tuple, Type
+
+from aamaze.base_maze import (DIRECTION_POSITIONS, Maze, MazeNode,
+                              SolvingAlgorithm)
+
+# (maze fingerprint, entrance index, exit index)
+CacheKey = Tuple[int, int, int]
+
+# Stored paths: number of nodes in the path (0 if the maze has no solution), then the direction of each step as its
+# position in DIRECTIONS, packed 4 steps per byte (first step in the lowest 2 bits).
+_PATH_HEADER = struct.Struct("<I")
+
+
+class SolutionCache:
+    # LRU cache of maze solutions, shared between mazes. Entries are keyed by the maze's fingerprint, entrance and
+    # exit, so mazes with the same layout share an entry. Paths are stored as packed step directions, not MazeNodes.
+    # The cache is bounded by max_entries and by max_bytes (the total size of the stored paths). If spill_directory
+    # is given, entries evicted from memory are written there and read back on a later miss (the directory is not
+    # bounded).
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 2 ** 24, spill_directory: str = None) -> None:
+        if max_entries < 1: raise ValueError(f"max_entries must be at least 1 (got {max_entries}).")
+        if max_bytes < 1: raise ValueError(f"max_bytes must be at least 1 (got {max_bytes}).")
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.spill_directory = spill_directory
+        if self.spill_directory is not None: os.makedirs(self.spill_directory, exist_ok=True)
+
+        self.entries: OrderedDict[CacheKey, bytes] = OrderedDict()
+        self.current_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.spill_hits = 0     # Hits that were read back from spill_directory (also counted in hits).
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, maze: Maze) -> bool:
+        key = self.get_key(maze)
+        return key in self.entries or (self.spill_directory is not None and os.path.exists(self._get_spill_path(key)))
+
+
+    def solve(self, maze: Maze, solver_type: Type[SolvingAlgorithm]) -> List[MazeNode]:
+        # Cached solution of the maze if there is one, else the solution found by solver_type (which is then cached).
+        solution = self.get(maze)
+        if solution is not None: return solution
+
+        solution = solver_type(maze).solve_maze()
+        self.put(maze, solution)
+        return solution
+
+    def get(self, maze: Maze) -> Optional[List[MazeNode]]:
+        # Returns None on a miss, and [] if the cached result is that the maze has no solution.
+        key = self.get_key(maze)
+        data = self.entries.get(key)
+
+        if data is not None:
+            self.entries.move_to_end(key)
+        elif self.spill_directory is not None:
+            data = self._read_spilled(key)
+            if data is not None:
+                self.spill_hits += 1
+                self._store(key, data)
+
+        if data is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return self.decode_path(maze, data)
+
+    def put(self, maze: Maze, solution: List[MazeNode]):
+        self._store(self.get_key(maze), self.encode_path(maze, solution))
+
+    def clear(self):
+        self.entries.clear()
+        self.current_bytes = 0
+
+
+    @staticmethod
+    def get_key(maze: Maze) -> CacheKey:
+        return (maze.fingerprint(), maze.get_node_index(maze.entrance_node), maze.get_node_index(maze.exit_node))
+
+    @staticmethod
+    def encode_path(maze: Maze, solution: List[MazeNode]) -> bytes:
+        path = [maze.get_node_index(node) for node in solution]
+        # Paths are replayed from the entrance by decode_path, so only entrance to exit paths can be stored.
+        if path and (path[0] != maze.get_node_index(maze.entrance_node) or
+                     path[-1] != maze.get_node_index(maze.exit_node)):
+            raise ValueError(f"Only paths from the entrance to the exit can be cached (got {path[0]} to {path[-1]}).")
+
+        packed_steps = bytearray((len(path) + 2) // 4)
+        for step, (index, next_index) in enumerate(zip(path, path[1:])):
+            direction = maze.get_direction(index, next_index)
+            if direction == 0:
+                raise ValueError(f"Only paths can be cached (nodes {index} and {next_index} are not neighbours).")
+            packed_steps[step >> 2] |= DIRECTION_POSITIONS[direction] << ((step & 3) * 2)
+
+        return _PATH_HEADER.pack(len(path)) + bytes(packed_steps)
+
+    @staticmethod
+    def decode_path(maze: Maze, data: bytes) -> List[MazeNode]:
+        path_length = _PATH_HEADER.unpack_from(data)[0]
+        if path_length == 0: return []
+
+        neighbour_tables = maze.neighbour_tables
+        index = maze.get_node_index(maze.entrance_node)
+        solution = [maze[index]]
+        for step in range(path_length - 1):
+            direction_position = (data[_PATH_HEADER.size + (step >> 2)] >> ((step & 3) * 2)) & 3
+            index = neighbour_tables[direction_position][index]
+            if index == -1: raise ValueError(f"Cached path leaves the maze at step {step + 1}.")
+            solution.append(maze[index])
+
+        if index != maze.get_node_index(maze.exit_node):
+            raise ValueError(f"Cached path ends at node {index} instead of the exit.")
+        return solution
+
+
+    def _store(self, key: CacheKey, data: bytes):
+        if key in self.entries: self.current_bytes -= len(self.entries.pop(key))
+        self.entries[key] = data
+        self.current_bytes += len(data)
+
+        while len(self.entries) > self.max_entries or self.current_bytes > self.max_bytes:
+            evicted_key, evicted_data = self.entries.popitem(last=False)
+            self.current_bytes -= len(evicted_data)
+            if self.spill_directory is not None: self._write_spilled(evicted_key, evicted_data)
+
+    def _get_spill_path(self, key: CacheKey) -> str:
+        return os.path.join(self.spill_directory, "{:016x}_{}_{}.path".format(*key))
+
+    def _write_spilled(self, key: CacheKey, data: bytes):
+        # Written to a temporary file first so that a reader never sees a half written entry.
+        spill_path = self._get_spill_path(key)
+        with open(spill_path + ".tmp", "wb") as file:
+            file.write(data)
+        os.replace(spill_path + ".tmp", spill_path)
+
+    def _read_spilled(self, key: CacheKey) -> Optional[bytes]:
+        try:
+            with open(self._get_spill_path(key), "rb") as file:
+                return file.read()
+        except FileNotFoundError:
+            return None
@@ -0,0 +1,24 @@
+# Run from the project root with: python -m benchmarks.eller_width
+# Times Eller on increasingly wide mazes of a fixed height.
+# Generation is linear in width if the time per node stays flat as the width grows.
+import time
+
+from aamaze.base_maze import Maze
+from aamaze.generation import Eller
+
+HEIGHT = 50
+WIDTHS = [625, 1250, 2500, 5000]
+
+
+def run():
+    for width in WIDTHS:
+        maze = Maze(width, HEIGHT)
+        start_time = time.perf_counter()
+        Eller(maze).generate_maze()
+        elapsed = time.perf_counter() - start_time
+
+        print(f"{width:>5}x{HEIGHT}: {elapsed * 1000:8.1f}ms ({elapsed * 1e9 / maze.size:6.0f}ns per node)")
+
+
+if __name__ == "__main__":
+    run()
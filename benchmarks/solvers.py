@@ -0,0 +1,55 @@
+# Run from the project root with: python -m benchmarks.solvers
+# Compares the shortest path solvers on the same mazes: nodes expanded and time taken to solve.
+# Also compares DeadEndFillSolver's stepping and vectorised (numpy) modes.
+# Kruskals mazes have short dead ends, RecursiveBacktracker mazes have long winding corridors.
+import time
+
+from aamaze.base_maze import Maze
+from aamaze.generation import Kruskals, RecursiveBacktracker
+from aamaze.solving import (AStarSolver, BidirectionalSolver, DeadEndFillSolver,
+                            DijkstraSolver)
+
+SIZES = [100, 250, 500]
+GENERATORS = [Kruskals, RecursiveBacktracker]
+SOLVERS = [AStarSolver, DijkstraSolver, BidirectionalSolver]
+
+
+def run():
+    for generator in GENERATORS:
+        for size in SIZES:
+            maze = Maze(size, size)
+            generator(maze).generate_maze()
+            print(f"{generator.__name__} {size}x{size}")
+
+            for solver_type in SOLVERS:
+                solver = solver_type(maze)
+                start_time = time.perf_counter()
+                solution = solver.solve_maze()
+                elapsed = time.perf_counter() - start_time
+
+                expanded = len(solver.get_incomplete_solution_nodes())
+                print(f"  {solver_type.__name__:<20} {expanded:>8} expanded ({expanded / maze.size:6.1%})"
+                      f" {elapsed * 1000:8.1f}ms  path length {len(solution)}")
+
+
+def run_dead_end_fill():
+    for generator in GENERATORS:
+        for size in SIZES:
+            maze = Maze(size, size)
+            generator(maze).generate_maze()
+
+            start_time = time.perf_counter()
+            DeadEndFillSolver(maze).solve_maze()
+            stepped_time = time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            DeadEndFillSolver(maze).solve_maze_vectorised()
+            vectorised_time = time.perf_counter() - start_time
+
+            print(f"DeadEndFillSolver {generator.__name__} {size}x{size}: stepped {stepped_time * 1000:8.1f}ms"
+                  f"  vectorised {vectorised_time * 1000:8.1f}ms")
+
+
+if __name__ == "__main__":
+    run()
+    run_dead_end_fill()
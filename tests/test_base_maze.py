@@ -1,9 +1,18 @@
+import gc
+import subprocess
+import sys
+import weakref
 from typing import List
 
 import pytest
 
-from aamaze.base_maze import (BOTTOM_WALL, LEFT_WALL, RIGHT_WALL, TOP_WALL,
-                              GenerationAlgorithm, Maze, MazeNode)
+import aamaze.base_maze
+from aamaze.base_maze import (BOTTOM_WALL, DIRECTION_POSITIONS, DIRECTIONS,
+                              DISTANCE_FIELD_CACHE_SIZE, LEFT_WALL,
+                              OPPOSITE_WALLS, RIGHT_WALL, TOP_WALL, UNREACHED,
+                              ComputedNeighbourTable, GenerationAlgorithm,
+                              Maze, MazeNode, get_neighbour_tables)
+from aamaze.generation import Kruskals
 
 
 class MockGenerationAlgorithm(GenerationAlgorithm):
@@ -127,6 +136,263 @@ class TestMaze:
         assert mock_maze_empty[index1].walls == correct_value1
         assert mock_maze_empty[index2].walls == correct_value2
 
+    @pytest.mark.parametrize("edit", ["add_walls", "remove_walls"])
+    def test_wall_helpers_make_a_single_edit(self, mock_maze_empty: Maze, edit: str):
+        changes = []
+        mock_maze_empty.add_wall_listener(changes.append)
+
+        getattr(GenerationAlgorithm, edit)(mock_maze_empty[9], mock_maze_empty[10])
+
+        assert mock_maze_empty.wall_version == 1
+        assert [list(indexes) for indexes in changes] == [[9, 10]]
+
+    def test_wall_helpers_standalone_nodes(self):
+        current_node, neighbour_node = MazeNode(2, 3, 0), MazeNode(2, 4, 0)
+
+        GenerationAlgorithm.add_walls(current_node, neighbour_node)
+        assert (current_node.walls, neighbour_node.walls) == (TOP_WALL, BOTTOM_WALL)
+
+        GenerationAlgorithm.remove_walls(neighbour_node, current_node)
+        assert (current_node.walls, neighbour_node.walls) == (0, 0)
+
+        GenerationAlgorithm.add_walls(current_node, MazeNode(3, 4, 0))
+        assert current_node.walls == 0
+
+    def test_wall_grid_one_byte_per_node(self, mock_maze: Maze):
+        assert isinstance(mock_maze.wall_grid, bytearray)
+        assert len(mock_maze.wall_grid) == mock_maze.size
+
+    @pytest.mark.parametrize("index", [0, 7, 29, -1])
+    def test_node_view_writes_to_wall_grid(self, mock_maze: Maze, index: int):
+        mock_maze[index].walls &= ~TOP_WALL
+
+        assert mock_maze.wall_grid[index] == 0b00000111
+        assert mock_maze[index].walls == 0b00000111
+
+    def test_node_views_compare_equal(self, mock_maze: Maze):
+        assert mock_maze[7] == mock_maze.get_node_from_coordinates(2, 1)
+        assert mock_maze[7] != mock_maze[8]
+        assert len({mock_maze[7], mock_maze[7], mock_maze[8]}) == 2
+
+    def test_maze_body_iteration_matches_indexing(self, mock_maze: Maze):
+        assert list(mock_maze) == [mock_maze[i] for i in range(mock_maze.size)]
+
+    @pytest.mark.parametrize("x, y", [(0, 0), (0, 1), (2, 1), (4, 4), (4, 5), (2, 3), (0, 5)])
+    def test_neighbour_indexes_match_neighbour_nodes(self, mock_maze: Maze, x: int, y: int):
+        neighbours = mock_maze.get_neighbours_from_coordinates(x, y)
+        neighbour_indexes = list(mock_maze.neighbour_indexes(x + (y * mock_maze.w)))
+
+        assert neighbour_indexes == [mock_maze.get_node_index(node) for node in neighbours]
+
+    @pytest.mark.parametrize("width, height", [(1, 1), (1, 4), (4, 1), (5, 6)])
+    def test_neighbour_tables_border_values(self, width: int, height: int):
+        above, below, left, right = Maze(width, height).neighbour_tables
+
+        assert len(above) == len(below) == len(left) == len(right) == width * height
+        assert all(above[i] == -1 for i in range((height - 1) * width, width * height))
+        assert all(below[i] == -1 for i in range(width))
+        assert all(left[i] == -1 for i in range(0, width * height, width))
+        assert all(right[i] == -1 for i in range(width - 1, width * height, width))
+
+    @pytest.mark.parametrize("direction", DIRECTIONS)
+    def test_direction_positions_match_neighbour_tables(self, mock_maze: Maze, direction: int):
+        table = mock_maze.neighbour_tables[DIRECTION_POSITIONS[direction]]
+        assert table[12] == mock_maze.get_neighbour_index(12, direction)
+        assert mock_maze.get_direction(12, table[12]) == direction
+
+    def test_neighbour_tables_freed_with_maze(self):
+        maze = Maze(5, 6)
+        tables = maze.neighbour_tables
+        assert maze.neighbour_tables is tables
+
+        table_ref = weakref.ref(tables[0])
+        del maze, tables
+        gc.collect()
+        assert table_ref() is None
+
+    @pytest.mark.parametrize("width, height", [(1, 1), (1, 4), (4, 1), (5, 6)])
+    def test_computed_neighbour_tables_match_arrays(self, width: int, height: int):
+        for direction, table in zip(DIRECTIONS, get_neighbour_tables(width, height)):
+            computed_table = ComputedNeighbourTable(direction, width, height)
+            assert [computed_table[i] for i in range(width * height)] == list(table)
+
+    def test_open_neighbours_filled_maze(self, mock_maze: Maze):
+        assert list(mock_maze.open_neighbours(7)) == []
+
+    def test_open_neighbours_empty_maze(self, mock_maze_empty: Maze):
+        assert list(mock_maze_empty.open_neighbours(9)) == [17, 1, 8, 10]
+        assert list(mock_maze_empty.open_neighbours(0)) == [8, 1]
+
+    @pytest.mark.parametrize("index, direction, neighbour_index", [(0, TOP_WALL, 5), (7, BOTTOM_WALL, 2),
+     (7, LEFT_WALL, 6), (7, RIGHT_WALL, 8), (29, TOP_WALL, -1), (4, RIGHT_WALL, -1)])
+    def test_get_neighbour_index(self, mock_maze: Maze, index: int, direction: int, neighbour_index: int):
+        assert mock_maze.get_neighbour_index(index, direction) == neighbour_index
+
+    @pytest.mark.parametrize("index, neighbour_index, direction", [(7, 12, TOP_WALL), (7, 2, BOTTOM_WALL),
+     (7, 6, LEFT_WALL), (7, 8, RIGHT_WALL), (4, 5, 0), (5, 4, 0), (7, 9, 0)])
+    def test_get_direction(self, mock_maze: Maze, index: int, neighbour_index: int, direction: int):
+        assert mock_maze.get_direction(index, neighbour_index) == direction
+
+    def test_get_direction_one_wide_maze(self):
+        maze = Maze(1, 4)
+        assert maze.get_direction(1, 2) == TOP_WALL
+        assert maze.get_direction(2, 1) == BOTTOM_WALL
+
+    @pytest.mark.parametrize("direction", DIRECTIONS)
+    def test_carve_removes_both_walls(self, mock_maze: Maze, direction: int):
+        mock_maze.carve(12, direction)
+        neighbour_index = mock_maze.get_neighbour_index(12, direction)
+
+        assert mock_maze.is_open(12, direction)
+        assert mock_maze.is_open(neighbour_index, OPPOSITE_WALLS[direction])
+        assert mock_maze.wall_grid[12] == 0b00001111 & ~direction
+
+    @pytest.mark.parametrize("direction", DIRECTIONS)
+    def test_build_adds_both_walls(self, mock_maze_empty: Maze, direction: int):
+        mock_maze_empty.build(20, direction)
+        neighbour_index = mock_maze_empty.get_neighbour_index(20, direction)
+
+        assert not mock_maze_empty.is_open(20, direction)
+        assert not mock_maze_empty.is_open(neighbour_index, OPPOSITE_WALLS[direction])
+        assert mock_maze_empty.wall_grid[20] == direction
+
+    def test_carve_on_border_opens_outside_wall(self, mock_maze: Maze):
+        mock_maze.carve(0, LEFT_WALL)
+
+        assert mock_maze.wall_grid[0] == 0b00001101
+        assert mock_maze.wall_grid[1] == 0b00001111
+
+    def test_wall_edits_change_wall_version(self, mock_maze: Maze):
+        versions = [mock_maze.wall_version]
+        mock_maze.carve(7, TOP_WALL)
+        versions.append(mock_maze.wall_version)
+        mock_maze.build(7, TOP_WALL)
+        versions.append(mock_maze.wall_version)
+        mock_maze[3].walls = 0
+        versions.append(mock_maze.wall_version)
+        mock_maze.set_row_walls(1, bytes(mock_maze.w))
+        versions.append(mock_maze.wall_version)
+
+        assert len(set(versions)) == len(versions)
+        assert mock_maze.wall_grid[mock_maze.w:2 * mock_maze.w] == bytes(mock_maze.w)
+
+    def test_distance_field_in_open_maze(self, mock_maze_empty: Maze):
+        distances = mock_maze_empty.distance_field(0)
+
+        for index in range(mock_maze_empty.size):
+            assert distances[index] == (index % mock_maze_empty.w) + (index // mock_maze_empty.w)
+
+    def test_distance_field_unreached_nodes(self, mock_maze: Maze):
+        mock_maze.carve(0, RIGHT_WALL)
+        distances = mock_maze.distance_field(0)
+
+        assert list(distances[:3]) == [0, 1, UNREACHED]
+        assert distances.count(UNREACHED) == mock_maze.size - 2
+
+    def test_distance_field_is_cached(self, mock_maze_empty: Maze):
+        distances = mock_maze_empty.distance_field(-1)
+
+        assert mock_maze_empty.distance_field(mock_maze_empty.size - 1) is distances
+        assert mock_maze_empty.distance_field(0) is not distances
+
+    def test_distance_field_cache_is_bounded(self, mock_maze_empty: Maze):
+        for index in range(DISTANCE_FIELD_CACHE_SIZE * 2): mock_maze_empty.distance_field(index)
+        assert len(mock_maze_empty._distance_fields) == DISTANCE_FIELD_CACHE_SIZE
+
+    @pytest.mark.parametrize("edit", ["carve", "build", "node_walls", "add_walls", "remove_walls", "set_row_walls"])
+    def test_distance_field_invalidated_by_wall_edits(self, mock_maze: Maze, edit: str):
+        for index in range(mock_maze.w - 1): mock_maze.carve(index, RIGHT_WALL)
+        distances = mock_maze.distance_field(0)
+
+        if edit == "carve": mock_maze.carve(1, TOP_WALL)
+        elif edit == "build": mock_maze.build(1, RIGHT_WALL)
+        elif edit == "node_walls": mock_maze[1].walls = 0b00001111
+        elif edit == "add_walls": GenerationAlgorithm.add_walls(mock_maze[1], mock_maze[2])
+        elif edit == "remove_walls": GenerationAlgorithm.remove_walls(mock_maze[1], mock_maze[6])
+        elif edit == "set_row_walls": mock_maze.set_row_walls(0, bytes([0b00001111]) * mock_maze.w)
+
+        new_distances = mock_maze.distance_field(0)
+        assert new_distances is not distances
+        assert new_distances == mock_maze.get_distance_field(0)
+        assert new_distances != distances
+
+    def test_wall_listeners_get_changed_indexes(self, mock_maze: Maze):
+        changes = []
+        mock_maze.add_wall_listener(changes.append)
+
+        mock_maze.carve(7, TOP_WALL)
+        mock_maze.build(0, LEFT_WALL)
+        mock_maze[3].walls = 0
+        mock_maze.set_row_walls(1, bytes(mock_maze.w))
+
+        assert [list(indexes) for indexes in changes] == [[7, 12], [0], [3], list(range(5, 10))]
+
+    def test_removed_wall_listener_not_called(self, mock_maze: Maze):
+        changes = []
+        mock_maze.add_wall_listener(changes.append)
+        mock_maze.remove_wall_listener(changes.append)
+
+        mock_maze.carve(7, TOP_WALL)
+        assert changes == []
+
+    def test_set_row_walls_wrong_length(self, mock_maze: Maze):
+        with pytest.raises(ValueError):
+            mock_maze.set_row_walls(0, bytes(mock_maze.w + 1))
+
+    def test_maze_body_index_out_of_range(self, mock_maze: Maze):
+        with pytest.raises(IndexError):
+            mock_maze[mock_maze.size]
+
+class TestMazeWallArray:
+    @pytest.fixture(autouse=True)
+    def require_numpy(self):
+        pytest.importorskip("numpy")
+
+    def test_wall_array_shape(self, mock_maze: Maze):
+        assert mock_maze.wall_array.shape == (6, 5)
+        assert str(mock_maze.wall_array.dtype) == "uint8"
+
+    def test_wall_array_shares_memory_with_maze(self, mock_maze: Maze):
+        mock_maze.wall_array[1, 2] = 0b00000011
+
+        assert mock_maze.get_node_from_coordinates(2, 1).walls == 0b00000011
+
+    def test_wall_mask(self, mock_maze_empty: Maze):
+        top_wall_mask = mock_maze_empty.get_wall_mask(TOP_WALL)
+
+        assert top_wall_mask[-1, :].all()
+        assert not top_wall_mask[:-1, :].any()
+
+    def test_opening_counts(self, mock_maze: Maze):
+        mock_maze.carve(6, RIGHT_WALL)
+        opening_counts = mock_maze.get_opening_counts()
+
+        assert opening_counts[1, 1] == 1
+        assert opening_counts[1, 2] == 1
+        assert opening_counts.sum() == 2
+        assert mock_maze.get_dead_end_mask().sum() == 2
+
+    @pytest.mark.parametrize("start_filled", [True, False])
+    def test_blank_mazes_match_without_numpy(self, monkeypatch, start_filled: bool):
+        with_numpy = Maze(7, 5, start_filled=start_filled)
+        monkeypatch.setattr(aamaze.base_maze, "np", None)
+        without_numpy = Maze(7, 5, start_filled=start_filled)
+
+        assert with_numpy.wall_grid == without_numpy.wall_grid
+
+    def test_wall_array_requires_numpy(self, monkeypatch, mock_maze: Maze):
+        monkeypatch.setattr(aamaze.base_maze, "np", None)
+
+        with pytest.raises(ImportError):
+            mock_maze.wall_array
+
+    def test_set_border_walls(self, mock_maze_empty: Maze):
+        mock_maze_empty.wall_array[:] = 0
+        mock_maze_empty.set_border_walls()
+
+        assert mock_maze_empty.wall_grid == Maze(8, 8, start_filled=False).wall_grid
+
+
 class TestMazeNode:
     def test_all_walls_filled_direct(self, maze_node_all_walls: MazeNode):
         assert maze_node_all_walls.walls == 15
@@ -143,3 +409,26 @@ class TestMazeNode:
     def test_get_current_walls_l_b_walls_case(self, maze_node_l_b_walls: MazeNode,
      key: str, value: bool):
         assert maze_node_l_b_walls.get_current_walls()[key] == value
+
+
+class TestWithoutNumpy:
+    def test_package_works_without_numpy(self):
+        # Runs in a new interpreter where "import numpy" fails, so the module level fallbacks are exercised too.
+        script = "\n".join([
+            "import sys",
+            "sys.modules['numpy'] = None",
+            "import aamaze, aamaze.generation, aamaze.solving",
+            "from aamaze.base_maze import Maze",
+            "from aamaze.generation import Kruskals",
+            "from aamaze.solving import AStarSolver",
+            "maze = Maze(9, 7)",
+            "Kruskals(maze, seed=1).generate_maze()",
+            "assert AStarSolver(maze).solve_maze()",
+            "print(maze.fingerprint())",
+        ])
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+
+        maze = Maze(9, 7)
+        Kruskals(maze, seed=1).generate_maze()
+        assert int(result.stdout.split()[-1]) == maze.fingerprint()
@@ -1,6 +1,10 @@
+import random
+from array import array
+
 import pytest
 
-from aamaze.base_maze import GenerationAlgorithm, Maze
+from aamaze.base_maze import (BOTTOM_WALL, RIGHT_WALL, TOP_WALL,
+                              GenerationAlgorithm, Maze)
 from aamaze.generation import (Eller, GrowingTree, Kruskals, Prims,
                                RecursiveBacktracker, RecursiveDivisor, Wilsons)
 from aamaze.solving import AStarSolver, FloodFillSolutionCheck
@@ -66,3 +70,240 @@ class TestGenerationAlgorithms:
         solver.solve_maze()
 
         assert solver.solved
+
+
+    @pytest.mark.parametrize("index", range(len(generation_algorithms_maze_sizes)))
+    def test_mazes_are_perfect(self, generation_algorithm_maze_size_pairs, index: int):
+        maze = Maze(*generation_algorithm_maze_size_pairs[index][1], start_filled=generation_algorithm_maze_size_pairs[index][2])
+        maze_generator: GenerationAlgorithm = generation_algorithm_maze_size_pairs[index][0](maze)
+        maze_generator.generate_maze()
+
+        assert count_passages(maze) == maze.size - 1
+
+
+class TestSeededGeneration:
+    @pytest.mark.parametrize("algorithm", algorithms)
+    def test_same_seed_same_maze(self, algorithm):
+        start_filled = algorithm not in start_empty_algorithms
+        mazes = [Maze(19, 13, start_filled=start_filled), Maze(19, 13, start_filled=start_filled)]
+        for maze in mazes: algorithm(maze, seed=2024).generate_maze()
+
+        assert mazes[0].wall_grid == mazes[1].wall_grid
+
+    @pytest.mark.parametrize("algorithm", algorithms)
+    def test_different_seeds_different_mazes(self, algorithm):
+        start_filled = algorithm not in start_empty_algorithms
+        mazes = [Maze(19, 13, start_filled=start_filled), Maze(19, 13, start_filled=start_filled)]
+        for seed, maze in enumerate(mazes): algorithm(maze, seed=seed).generate_maze()
+
+        assert mazes[0].wall_grid != mazes[1].wall_grid
+
+    @pytest.mark.parametrize("algorithm", algorithms)
+    def test_random_instance_used_as_given(self, algorithm):
+        start_filled = algorithm not in start_empty_algorithms
+        rng = random.Random(5)
+        generator = algorithm(Maze(9, 9, start_filled=start_filled), seed=rng)
+
+        assert generator.random is rng
+        generator.generate_maze()
+        assert rng.getstate() != random.Random(5).getstate()
+
+    @pytest.mark.parametrize("algorithm", algorithms)
+    def test_global_random_state_unused(self, algorithm):
+        start_filled = algorithm not in start_empty_algorithms
+        random.seed(3)
+        global_state = random.getstate()
+        algorithm(Maze(9, 9, start_filled=start_filled), seed=1).generate_maze()
+
+        assert random.getstate() == global_state
+
+    def test_numpy_generator_seed(self):
+        np = pytest.importorskip("numpy")
+        mazes = [Maze(12, 12), Maze(12, 12)]
+        for maze in mazes: Wilsons(maze, seed=np.random.default_rng(8)).generate_maze()
+
+        assert mazes[0].wall_grid == mazes[1].wall_grid
+
+
+class TestKruskals:
+    def test_same_seed_same_maze(self):
+        mazes = [Maze(24, 17), Maze(24, 17)]
+        for maze in mazes: Kruskals(maze, seed=12).generate_maze()
+
+        assert mazes[0].wall_grid == mazes[1].wall_grid
+
+    def test_edge_arrays_cover_all_inner_walls(self):
+        generator = Kruskals(Maze(5, 4))
+
+        assert len(generator.horizontal_edges) == 16
+        assert len(generator.vertical_edges) == 15
+        assert 4 not in generator.horizontal_edges
+
+
+class TestPrims:
+    def test_add_frontier_nodes_skips_duplicates_and_visited(self):
+        generator = Prims(Maze(4, 4))
+        generator.visit_status[5] = True
+        generator.add_frontier_nodes(5)
+        generator.add_frontier_nodes(6)
+
+        assert sorted(generator.frontier_nodes) == [1, 2, 4, 6, 7, 9, 10]
+
+    def test_all_nodes_visited(self):
+        generator = Prims(Maze(9, 6))
+        generator.generate_maze()
+
+        assert all(generator.visit_status)
+        assert generator.frontier_nodes == []
+
+
+class TestRecursiveBacktracker:
+    @pytest.mark.parametrize("start_index", [0, 17, 53, -1, -54])
+    def test_start_index(self, start_index: int):
+        maze = Maze(9, 6)
+        generator = RecursiveBacktracker(maze, start_index=start_index)
+        generator.generate_maze()
+
+        assert generator.start_index == start_index % maze.size
+        assert all(generator.visit_status)
+        assert generator.node_stack == []
+        assert count_passages(maze) == maze.size - 1
+
+    @pytest.mark.parametrize("start_index", [54, -55, 10_000])
+    def test_start_index_out_of_range(self, start_index: int):
+        with pytest.raises(IndexError):
+            RecursiveBacktracker(Maze(9, 6), start_index=start_index)
+
+
+class TestGrowingTree:
+    @pytest.mark.parametrize("mode", ["random", "newest", "oldest", "random-newest-split-0",
+                                      "random-newest-split-50", "random-newest-split-99",
+                                      lambda count, rng: count // 2])
+    def test_selection_modes_make_perfect_maze(self, mode):
+        maze = Maze(13, 9)
+        GrowingTree(maze, mode=mode).generate_maze()
+
+        assert count_passages(maze) == maze.size - 1
+
+    @pytest.mark.parametrize("mode", ["", "newer", "random-newest-split-", "random-newest-split-x5"])
+    def test_invalid_mode_raises_value_error(self, mode: str):
+        with pytest.raises(ValueError):
+            GrowingTree(Maze(4, 4), mode=mode)
+
+    def test_selection_mode_can_be_changed_after_construction(self):
+        generator = GrowingTree(Maze(4, 4))
+        generator.node_selection_mode = "newest"
+
+        assert generator.node_selection_mode == "newest"
+        with pytest.raises(ValueError):
+            generator.node_selection_mode = "invalid"
+
+    def test_selection_strategy_gets_generator_random(self):
+        rngs = []
+        def select_newest_recording_rng(count: int, rng: random.Random) -> int:
+            rngs.append(rng)
+            return count - 1
+
+        generator = GrowingTree(Maze(5, 5), mode=select_newest_recording_rng, seed=3)
+        generator.generate_maze()
+
+        assert len(rngs) > 0
+        assert all(rng is generator.random for rng in rngs)
+
+    def test_remove_working_node_keeps_oldest_first_and_newest_last(self):
+        generator = GrowingTree(Maze(4, 4))
+        generator.working_nodes = [3, 5, 8, 13, 21]
+        generator.working_start = 0
+
+        generator.remove_working_node(3)
+        assert generator.working_nodes[generator.working_start:] == [3, 8, 5, 21]
+
+        generator.remove_working_node(4)
+        assert generator.working_nodes[generator.working_start:] == [3, 8, 5]
+
+        generator.remove_working_node(2)
+        assert generator.working_nodes[generator.working_start:] == [3, 5]
+
+        generator.remove_working_node(2)
+        assert generator.working_nodes[generator.working_start:] == [5]
+
+
+class TestWilsons:
+    def test_remove_unvisited_node(self):
+        generator = Wilsons(Maze(3, 2))
+        generator.unvisited_nodes = list(range(6))
+        generator.unvisited_positions = array("i", range(6))
+
+        generator.remove_unvisited_node(1)
+        generator.remove_unvisited_node(5)
+
+        assert generator.unvisited_nodes == [0, 4, 2, 3]
+        assert [generator.unvisited_positions[node] for node in generator.unvisited_nodes] == [0, 1, 2, 3]
+
+    def test_all_nodes_in_tree(self):
+        generator = Wilsons(Maze(11, 8))
+        generator.generate_maze()
+
+        assert all(generator.in_tree)
+        assert generator.unvisited_nodes == []
+
+
+class TestRecursiveDivisor:
+    @pytest.mark.parametrize("width, height", [[2, 3000], [3000, 2], [1, 500]])
+    def test_long_thin_mazes(self, width: int, height: int):
+        maze = Maze(width, height, start_filled=False)
+        RecursiveDivisor(maze).generate_maze()
+
+        assert count_passages(maze) == maze.size - 1
+
+    def test_bisect_area_only_changes_area(self):
+        maze = Maze(8, 8, start_filled=False)
+        RecursiveDivisor(maze).bisect_area(2, 3, 4, 4)
+
+        for index in range(maze.size):
+            x, y = index % maze.w, index // maze.w
+            if 1 <= x <= 6 and 2 <= y <= 7: continue
+            assert maze.wall_grid[index] == Maze(8, 8, start_filled=False).wall_grid[index]
+
+
+def count_passages(maze: Maze) -> int:
+    # Number of carved walls between neighbouring nodes (size - 1 for a perfect maze).
+    passages = 0
+    for index in range(maze.size):
+        if index % maze.w != maze.w - 1 and maze.is_open(index, RIGHT_WALL): passages += 1
+        if index < maze.size - maze.w and maze.is_open(index, TOP_WALL): passages += 1
+    return passages
+
+
+class TestEllerRowStream:
+    @pytest.mark.parametrize("width, height", [[21, 7], [1, 5], [5, 1], [16, 16]])
+    def test_streamed_rows_form_perfect_maze(self, width: int, height: int):
+        rows = list(Eller.iter_rows(width, seed=4, height=height))
+        maze = Maze(width, height, wall_grid=bytearray(b"".join(rows)))
+
+        solver = FloodFillSolutionCheck(maze)
+        solver.solve_maze()
+
+        assert len(rows) == height
+        assert all(len(row) == width for row in rows)
+        assert solver.solved
+        assert count_passages(maze) == maze.size - 1
+
+    def test_streamed_rows_have_outer_walls(self):
+        rows = list(Eller.iter_rows(9, seed=1, height=6))
+
+        assert all(walls & BOTTOM_WALL for walls in rows[0])
+        assert all(walls & TOP_WALL for walls in rows[-1])
+
+    def test_unbounded_stream_finish(self):
+        stream = Eller.iter_rows(12, seed=7)
+        rows = [next(stream) for _ in range(40)]
+        rows.append(stream.finish())
+        maze = Maze(12, 41, wall_grid=bytearray(b"".join(rows)))
+
+        assert count_passages(maze) == maze.size - 1
+        with pytest.raises(StopIteration):
+            next(stream)
+
+    def test_same_seed_same_rows(self):
+        assert list(Eller.iter_rows(15, seed=3, height=10)) == list(Eller.iter_rows(15, seed=3, height=10))
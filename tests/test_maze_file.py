@@ -0,0 +1,169 @@
+import pytest
+
+import aamaze.base_maze
+import aamaze.maze_file
+from aamaze.base_maze import (BOTTOM_WALL, TOP_WALL, ComputedNeighbourTable,
+                              Maze)
+from aamaze.generation import Eller, Kruskals
+from aamaze.maze_file import (MAZE_FILE_HEADER, pack_walls, packed_size,
+                              unpack_walls)
+from aamaze.solving import FloodFillSolutionCheck
+
+
+@pytest.fixture
+def kruskals_maze_inner_exits() -> Maze:
+    maze = Maze(13, 7, entrance_index=3, exit_index=-5)
+    generator = Kruskals(maze)
+    generator.generate_maze()
+    generator.create_entrance_and_exit()
+    return maze
+
+
+numpy_modes = [True, False]
+
+
+class TestWallPacking:
+    @pytest.mark.parametrize("use_numpy", numpy_modes)
+    @pytest.mark.parametrize("size", [0, 1, 2, 7, 64])
+    def test_pack_unpack_round_trip(self, monkeypatch, use_numpy: bool, size: int):
+        if not use_numpy: monkeypatch.setattr(aamaze.maze_file, "np", None)
+        elif aamaze.maze_file.np is None: pytest.skip("numpy is not installed")
+        wall_grid = bytearray(i % 16 for i in range(size))
+
+        packed = pack_walls(wall_grid)
+
+        assert len(packed) == packed_size(size)
+        assert unpack_walls(packed, size) == wall_grid
+
+    @pytest.mark.parametrize("use_numpy", numpy_modes)
+    def test_pack_walls_nibble_order(self, monkeypatch, use_numpy: bool):
+        if not use_numpy: monkeypatch.setattr(aamaze.maze_file, "np", None)
+        elif aamaze.maze_file.np is None: pytest.skip("numpy is not installed")
+
+        assert pack_walls(bytearray([0b0001, 0b1000, 0b0110])) == bytes([0b10000001, 0b00000110])
+
+    def test_unpack_walls_too_short(self):
+        with pytest.raises(ValueError):
+            unpack_walls(b"\x00", 3)
+
+
+class TestMazeFile:
+    def test_to_bytes_size(self):
+        maze = Maze(100, 50)
+        assert len(maze.to_bytes()) == MAZE_FILE_HEADER.size + 2500
+
+    def test_round_trip_preserves_walls_and_ends(self, kruskals_maze_inner_exits: Maze):
+        loaded = Maze.from_bytes(kruskals_maze_inner_exits.to_bytes())
+
+        assert (loaded.w, loaded.h) == (13, 7)
+        assert loaded.wall_grid == kruskals_maze_inner_exits.wall_grid
+        assert loaded.get_node_index(loaded.entrance_node) == 3
+        assert loaded.get_node_index(loaded.exit_node) == 86
+
+    def test_save_and_load(self, tmp_path, kruskals_maze_inner_exits: Maze):
+        path = tmp_path / "maze.aamz"
+        kruskals_maze_inner_exits.save(path)
+        loaded = Maze.load(path)
+
+        assert loaded.wall_grid == kruskals_maze_inner_exits.wall_grid
+        assert loaded.start_filled
+
+    @pytest.mark.parametrize("data", [b"", b"NOPE" + bytes(MAZE_FILE_HEADER.size)])
+    def test_from_bytes_invalid_data(self, data: bytes):
+        with pytest.raises(ValueError):
+            Maze.from_bytes(data)
+
+    def test_from_bytes_unsupported_version(self):
+        data = bytearray(Maze(4, 4).to_bytes())
+        data[4] = 99
+
+        with pytest.raises(ValueError):
+            Maze.from_bytes(bytes(data))
+
+
+class TestMazeMmap:
+    @pytest.mark.parametrize("start_filled", [True, False])
+    @pytest.mark.parametrize("size", [[1, 1], [6, 1], [1, 6], [5, 2], [9, 7]])
+    def test_create_mmap_matches_blank_maze(self, tmp_path, start_filled: bool, size: list):
+        with Maze.create_mmap(tmp_path / "maze.aamz", *size, start_filled=start_filled) as maze:
+            assert maze.wall_grid == Maze(*size, start_filled=start_filled).wall_grid
+
+    def test_open_mmap_reads_unpacked_file(self, tmp_path, kruskals_maze_inner_exits: Maze):
+        path = tmp_path / "maze.aamz"
+        kruskals_maze_inner_exits.save(path, packed=False)
+
+        with Maze.open_mmap(path) as first, Maze.open_mmap(path) as second:
+            assert first.wall_grid == kruskals_maze_inner_exits.wall_grid
+            assert second.wall_grid == kruskals_maze_inner_exits.wall_grid
+            assert first.get_node_index(first.exit_node) == 86
+
+    def test_open_mmap_neighbour_tables_built_once(self, tmp_path):
+        path = tmp_path / "maze.aamz"
+        Maze(4, 4).save(path, packed=False)
+
+        with Maze.open_mmap(path) as maze:
+            tables = maze.neighbour_tables
+            assert all(isinstance(table, ComputedNeighbourTable) for table in tables)
+            assert maze.neighbour_tables is tables
+
+    def test_close_with_wall_array_alive(self, tmp_path):
+        if aamaze.base_maze.np is None: pytest.skip("numpy is not installed")
+        path = tmp_path / "maze.aamz"
+        Maze(4, 4).save(path, packed=False)
+
+        maze = Maze.open_mmap(path)
+        walls = maze.wall_array
+        with pytest.raises(BufferError, match="wall_array"):
+            maze.close()
+        assert walls[0, 0] == maze.wall_grid[0]
+
+        del walls
+        maze.close()
+
+    def test_close_after_temporary_wall_arrays(self, tmp_path):
+        if aamaze.base_maze.np is None: pytest.skip("numpy is not installed")
+        path = tmp_path / "maze.aamz"
+        Maze(4, 4).save(path, packed=False)
+
+        with Maze.open_mmap(path) as maze:
+            assert maze.get_dead_end_mask().sum() == 0
+            assert maze.wall_array.shape == (4, 4)
+
+    def test_open_mmap_read_only(self, tmp_path):
+        path = tmp_path / "maze.aamz"
+        Maze(4, 4).save(path, packed=False)
+
+        with Maze.open_mmap(path, "r") as maze:
+            with pytest.raises(TypeError):
+                maze.carve(5, TOP_WALL)
+
+    @pytest.mark.parametrize("mode, persisted", [("r+", True), ("c", False)])
+    def test_open_mmap_write_modes(self, tmp_path, mode: str, persisted: bool):
+        path = tmp_path / "maze.aamz"
+        Maze(4, 4).save(path, packed=False)
+
+        with Maze.open_mmap(path, mode) as maze:
+            maze.carve(5, TOP_WALL)
+            assert maze.is_open(9, BOTTOM_WALL)
+
+        assert Maze.load(path).is_open(5, TOP_WALL) == persisted
+
+    def test_open_mmap_rejects_packed_file(self, tmp_path):
+        path = tmp_path / "maze.aamz"
+        Maze(4, 4).save(path)
+
+        with pytest.raises(ValueError):
+            Maze.open_mmap(path)
+
+    def test_open_mmap_invalid_mode(self, tmp_path):
+        with pytest.raises(ValueError):
+            Maze.open_mmap(tmp_path / "maze.aamz", "w")
+
+    def test_mmap_maze_generate_and_flood_fill(self, tmp_path):
+        with Maze.create_mmap(tmp_path / "maze.aamz", 17, 11) as maze:
+            Eller(maze).generate_maze()
+            maze.flush()
+
+            solver = FloodFillSolutionCheck(maze)
+            solver.solve_maze()
+            assert solver.solved
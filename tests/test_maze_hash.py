@@ -0,0 +1,131 @@
+import pytest
+
+import aamaze.maze_hash
+from aamaze.base_maze import LEFT_WALL, RIGHT_WALL, TOP_WALL, UNREACHED, Maze
+from aamaze.generation import Eller, Kruskals
+from aamaze.maze_hash import get_walls_key, hash_wall_grid, mix64
+from aamaze.maze_tree import MazeTree
+from aamaze.solving import AStarSolver, SolutionCache
+
+
+@pytest.fixture
+def kruskals_maze() -> Maze:
+    maze = Maze(12, 9)
+    Kruskals(maze).generate_maze()
+    return maze
+
+
+numpy_modes = [True, False]
+
+
+class TestWallHash:
+    def test_mix64_known_values(self):
+        # splitmix64 reference outputs, so fingerprints stay the same between versions and processes.
+        assert mix64(0) == 0xE220A8397B1DCDAF
+        assert mix64(1) == 0x910A2DEC89025CC1
+
+    @pytest.mark.parametrize("use_numpy", numpy_modes)
+    @pytest.mark.parametrize("size", [0, 1, 7, 300])
+    def test_hash_wall_grid_is_xor_of_keys(self, monkeypatch, use_numpy: bool, size: int):
+        if not use_numpy: monkeypatch.setattr(aamaze.maze_hash, "np", None)
+        elif aamaze.maze_hash.np is None: pytest.skip("numpy is not installed")
+        wall_grid = bytearray((i * 7) % 256 for i in range(size))
+
+        expected_hash = 0
+        for index, walls in enumerate(wall_grid): expected_hash ^= get_walls_key(index, walls)
+
+        assert hash_wall_grid(wall_grid) == expected_hash
+
+    def test_walls_key_combines_bits(self):
+        assert get_walls_key(5, TOP_WALL | LEFT_WALL) == get_walls_key(5, TOP_WALL) ^ get_walls_key(5, LEFT_WALL)
+        assert get_walls_key(5, 0) == 0
+        assert get_walls_key(5, TOP_WALL) != get_walls_key(6, TOP_WALL)
+
+
+class TestMazeFingerprint:
+    def test_known_fingerprints(self):
+        assert Maze(4, 3).fingerprint() == 0x051DE9D9CA93B414
+        assert Maze(4, 3, start_filled=False).fingerprint() == 0x5A47F0C2B2D2BB37
+
+    def test_same_maze_same_fingerprint(self, kruskals_maze: Maze):
+        copied_maze = Maze.from_bytes(kruskals_maze.to_bytes())
+        assert copied_maze.fingerprint() == kruskals_maze.fingerprint()
+
+    @pytest.mark.parametrize("entrance_index, exit_index", [[1, -1], [0, -2], [-1, 0]])
+    def test_entrance_and_exit_change_fingerprint(self, kruskals_maze: Maze, entrance_index: int, exit_index: int):
+        other_maze = Maze(12, 9, entrance_index=entrance_index, exit_index=exit_index,
+                          wall_grid=bytearray(kruskals_maze.wall_grid))
+        assert other_maze.fingerprint() != kruskals_maze.fingerprint()
+
+    def test_size_changes_fingerprint(self):
+        assert Maze(4, 6).fingerprint() != Maze(6, 4, exit_index=23).fingerprint()
+
+    def test_wall_edits_update_fingerprint(self, kruskals_maze: Maze):
+        original_fingerprint = kruskals_maze.fingerprint()
+
+        kruskals_maze.build(20, TOP_WALL)
+        kruskals_maze.carve(20, RIGHT_WALL)
+        kruskals_maze[30].walls ^= LEFT_WALL
+        kruskals_maze.set_row_walls(4, bytes(range(12)))
+        kruskals_maze.set_border_walls()
+        edited_fingerprint = kruskals_maze.fingerprint()
+
+        kruskals_maze._wall_hash = None
+        assert kruskals_maze.fingerprint() == edited_fingerprint
+        assert edited_fingerprint != original_fingerprint
+
+    def test_undoing_edit_restores_fingerprint(self, kruskals_maze: Maze):
+        original_fingerprint = kruskals_maze.fingerprint()
+        walls_open = kruskals_maze.is_open(40, TOP_WALL)
+
+        kruskals_maze.build(40, TOP_WALL)
+        kruskals_maze.carve(40, TOP_WALL)
+        if not walls_open: kruskals_maze.build(40, TOP_WALL)
+
+        assert kruskals_maze.fingerprint() == original_fingerprint
+
+    def test_fingerprint_tracked_during_generation(self):
+        maze = Maze(10, 8)
+        maze.fingerprint()
+        Eller(maze).generate_maze()
+        generated_fingerprint = maze.fingerprint()
+
+        maze._wall_hash = None
+        assert maze.fingerprint() == generated_fingerprint
+
+
+class TestDirectWallEdits:
+    @pytest.fixture(autouse=True)
+    def require_numpy(self):
+        pytest.importorskip("numpy")
+
+    @pytest.fixture
+    def solved_maze(self) -> Maze:
+        maze = Maze(6, 6)
+        Kruskals(maze, seed=3).generate_maze()
+        return maze
+
+    def test_mark_walls_changed_updates_fingerprint(self, solved_maze: Maze):
+        original_fingerprint = solved_maze.fingerprint()
+        solved_maze.wall_array[:, :] = 0b00001111
+        solved_maze.mark_walls_changed()
+
+        assert solved_maze.fingerprint() != original_fingerprint
+        assert solved_maze.fingerprint() == Maze(6, 6).fingerprint()
+
+    def test_mark_walls_changed_invalidates_derived_results(self, solved_maze: Maze):
+        cache = SolutionCache()
+        tree = MazeTree(solved_maze)
+        changes = []
+        solved_maze.add_wall_listener(changes.append)
+        assert cache.solve(solved_maze, AStarSolver) != []
+        assert solved_maze.distance_field(0)[solved_maze.size - 1] != UNREACHED
+
+        solved_maze.wall_array[:, :] = 0b00001111
+        solved_maze.mark_walls_changed()
+
+        assert cache.solve(solved_maze, AStarSolver) == []
+        assert solved_maze.distance_field(0)[solved_maze.size - 1] == UNREACHED
+        with pytest.raises(ValueError):
+            tree.distance(0, -1)
+        assert list(changes[0]) == list(range(solved_maze.size))
@@ -0,0 +1,125 @@
+import pytest
+
+import aamaze.maze_tree
+from aamaze.base_maze import RIGHT_WALL, TOP_WALL, Maze
+from aamaze.generation import Kruskals, RecursiveBacktracker
+from aamaze.maze_tree import MazeTree
+from aamaze.solving import AStarSolver
+
+
+@pytest.fixture(scope="module")
+def kruskals_maze_24() -> Maze:
+    maze = Maze(24, 17)
+    Kruskals(maze).generate_maze()
+    return maze
+
+@pytest.fixture(scope="module")
+def recursive_backtracker_maze_24() -> Maze:
+    maze = Maze(24, 24)
+    RecursiveBacktracker(maze).generate_maze()
+    return maze
+
+
+def a_star_path(maze: Maze, a: int, b: int):
+    query_maze = Maze(maze.w, maze.h, entrance_index=a, exit_index=b, wall_grid=bytearray(maze.wall_grid))
+    return [query_maze.get_node_index(node) for node in AStarSolver(query_maze).solve_maze()]
+
+
+numpy_modes = [True, False]
+
+
+class TestMazeTree:
+    @pytest.mark.parametrize("use_numpy", numpy_modes)
+    @pytest.mark.parametrize("maze_fixture", ["kruskals_maze_24", "recursive_backtracker_maze_24"])
+    def test_paths_match_a_star(self, monkeypatch, request, use_numpy: bool, maze_fixture: str):
+        if not use_numpy: monkeypatch.setattr(aamaze.maze_tree, "np", None)
+        elif aamaze.maze_tree.np is None: pytest.skip("numpy is not installed")
+        maze: Maze = request.getfixturevalue(maze_fixture)
+        tree = MazeTree(maze)
+
+        for a, b in [(0, maze.size - 1), (5, 300), (300, 5), (maze.w * 3, maze.w * 3 + 7), (17, 17)]:
+            expected_path = a_star_path(maze, a, b)
+
+            assert tree.path_indexes(a, b) == expected_path
+            assert tree.distance(a, b) == len(expected_path) - 1
+
+    def test_path_returns_maze_nodes(self, kruskals_maze_24: Maze):
+        path = MazeTree(kruskals_maze_24).path(0, -1)
+
+        assert path[0] == kruskals_maze_24.entrance_node
+        assert path[-1] == kruskals_maze_24.exit_node
+
+    def test_lowest_common_ancestor_of_root(self, kruskals_maze_24: Maze):
+        tree = MazeTree(kruskals_maze_24, root_index=40)
+
+        assert tree.depths[40] == 0
+        assert tree.lowest_common_ancestor(40, 100) == 40
+        assert tree.lowest_common_ancestor(100, 40) == 40
+
+    def test_negative_indexes(self, kruskals_maze_24: Maze):
+        tree = MazeTree(kruskals_maze_24)
+        last_index = kruskals_maze_24.size - 1
+
+        assert tree.lowest_common_ancestor(-1, -1) == last_index
+        assert tree.lowest_common_ancestor(-1, 100) == tree.lowest_common_ancestor(last_index, 100)
+        assert tree.distance(-1, 100) == tree.distance(last_index, 100)
+        assert tree.path_indexes(-1, 100) == tree.path_indexes(last_index, 100)
+
+    @pytest.mark.parametrize("a, b", [(408, 0), (0, -409), (10_000, 10_000)])
+    def test_out_of_range_indexes_raise(self, kruskals_maze_24: Maze, a: int, b: int):
+        tree = MazeTree(kruskals_maze_24)
+
+        with pytest.raises(IndexError):
+            tree.lowest_common_ancestor(a, b)
+        with pytest.raises(IndexError):
+            tree.distance(a, b)
+        with pytest.raises(IndexError):
+            tree.path_indexes(a, b)
+
+    @pytest.mark.parametrize("maze_size", [1, 2])
+    def test_small_mazes(self, maze_size: int):
+        maze = Maze(maze_size, maze_size)
+        Kruskals(maze).generate_maze()
+        tree = MazeTree(maze)
+
+        assert tree.distance(0, 0) == 0
+        assert tree.distance(0, -1) == len(a_star_path(maze, 0, maze.size - 1)) - 1
+
+    def test_not_rebuilt_if_walls_unchanged(self, kruskals_maze_24: Maze):
+        tree = MazeTree(kruskals_maze_24)
+        parents = tree.parents
+        tree.distance(3, 50)
+
+        assert tree.parents is parents
+
+    def test_rebuilt_after_walls_change(self):
+        maze = Maze(6, 1)
+        for i in range(5): maze.carve(i, RIGHT_WALL)
+        tree = MazeTree(maze)
+        assert tree.distance(0, 5) == 5
+
+        # Splitting the maze in two means it is no longer a perfect maze.
+        maze.build(2, RIGHT_WALL)
+        with pytest.raises(ValueError):
+            tree.distance(0, 5)
+
+    def test_rebuilt_after_wall_moved(self):
+        maze = Maze(2, 2)
+        maze.carve(0, RIGHT_WALL)
+        maze.carve(0, TOP_WALL)
+        maze.carve(2, RIGHT_WALL)
+        tree = MazeTree(maze)
+        assert tree.distance(1, 3) == 3
+
+        maze.build(2, RIGHT_WALL)
+        maze.carve(1, TOP_WALL)
+        assert tree.distance(1, 3) == 1
+        assert tree.path_indexes(2, 3) == [2, 0, 1, 3]
+
+    def test_maze_with_loop_raises(self):
+        with pytest.raises(ValueError):
+            MazeTree(Maze(3, 3, start_filled=False))
+
+    def test_unreachable_node_raises(self):
+        with pytest.raises(ValueError):
+            MazeTree(Maze(3, 3))
@@ -0,0 +1,160 @@
+import os
+
+import pytest
+
+from aamaze.base_maze import TOP_WALL, Maze
+from aamaze.generation import Kruskals, RecursiveBacktracker
+from aamaze.solving import (AStarSolver, DijkstraSolver,
+                            FloodFillSolutionCheck, SolutionCache)
+
+
+@pytest.fixture
+def kruskal_maze_16() -> Maze:
+    maze = Maze(16, 16)
+    Kruskals(maze).generate_maze()
+    return maze
+
+@pytest.fixture
+def recursive_backtracker_maze_16() -> Maze:
+    maze = Maze(16, 16)
+    RecursiveBacktracker(maze).generate_maze()
+    return maze
+
+
+def copy_maze(maze: Maze, entrance_index: int = 0, exit_index: int = -1) -> Maze:
+    return Maze(maze.w, maze.h, entrance_index=entrance_index, exit_index=exit_index,
+                wall_grid=bytearray(maze.wall_grid))
+
+
+class TestSolutionCache:
+    def test_encode_decode_round_trip(self, recursive_backtracker_maze_16: Maze):
+        solution = AStarSolver(recursive_backtracker_maze_16).solve_maze()
+        data = SolutionCache.encode_path(recursive_backtracker_maze_16, solution)
+
+        assert len(data) == 4 + ((len(solution) + 2) // 4)
+        assert SolutionCache.decode_path(recursive_backtracker_maze_16, data) == solution
+
+    @pytest.mark.parametrize("path_length", [1, 2, 4, 5, 6])
+    def test_encode_decode_short_paths(self, path_length: int):
+        maze = Maze(path_length, 1, start_filled=False)
+        solution = AStarSolver(maze).solve_maze()
+        assert len(solution) == path_length
+
+        assert SolutionCache.decode_path(maze, SolutionCache.encode_path(maze, solution)) == solution
+
+    def test_only_paths_can_be_cached(self, kruskal_maze_16: Maze):
+        flood_fill = FloodFillSolutionCheck(kruskal_maze_16)
+        flood_fill.solve_maze()
+
+        with pytest.raises(ValueError):
+            SolutionCache().put(kruskal_maze_16, flood_fill.solution)
+
+    def test_only_entrance_to_exit_paths_can_be_cached(self, kruskal_maze_16: Maze):
+        solution = AStarSolver(kruskal_maze_16).solve_maze()
+
+        with pytest.raises(ValueError):
+            SolutionCache().put(kruskal_maze_16, solution[::-1])
+        with pytest.raises(ValueError):
+            SolutionCache().put(kruskal_maze_16, solution[:-1])
+
+    @pytest.mark.parametrize("steps", [[1], [0], [3, 3, 1]])
+    def test_decode_invalid_path(self, kruskal_maze_16: Maze, steps: list):
+        # Steps go below the maze, or end somewhere other than the exit.
+        packed_steps = sum(direction_position << (step * 2) for step, direction_position in enumerate(steps))
+        data = (len(steps) + 1).to_bytes(4, "little") + bytes([packed_steps])
+
+        with pytest.raises(ValueError):
+            SolutionCache.decode_path(kruskal_maze_16, data)
+
+    def test_hits_and_misses(self, kruskal_maze_16: Maze):
+        cache = SolutionCache()
+        solution = cache.solve(kruskal_maze_16, AStarSolver)
+
+        assert cache.solve(kruskal_maze_16, DijkstraSolver) == solution
+        assert cache.get(kruskal_maze_16) == solution
+        assert cache.hits == 2
+        assert cache.misses == 1
+        assert len(cache) == 1
+
+    def test_same_layout_shares_entry(self, kruskal_maze_16: Maze):
+        cache = SolutionCache()
+        cache.solve(kruskal_maze_16, AStarSolver)
+        other_maze = copy_maze(kruskal_maze_16)
+
+        assert other_maze in cache
+        assert [node.x + (node.y * 16) for node in cache.get(other_maze)] == \
+            [node.x + (node.y * 16) for node in AStarSolver(kruskal_maze_16).solve_maze()]
+
+    def test_different_endpoints_miss(self, kruskal_maze_16: Maze):
+        cache = SolutionCache()
+        cache.solve(kruskal_maze_16, AStarSolver)
+
+        assert cache.get(copy_maze(kruskal_maze_16, entrance_index=5)) is None
+        assert cache.get(copy_maze(kruskal_maze_16, exit_index=-5)) is None
+        assert cache.misses == 3
+
+    def test_wall_edit_misses(self, kruskal_maze_16: Maze):
+        cache = SolutionCache()
+        cache.solve(kruskal_maze_16, AStarSolver)
+        closed_index = next(index for index in range(kruskal_maze_16.size - 16)
+                            if not kruskal_maze_16.is_open(index, TOP_WALL))
+        kruskal_maze_16.carve(closed_index, TOP_WALL)
+
+        assert kruskal_maze_16 not in cache
+
+    def test_unsolvable_maze_cached(self):
+        cache = SolutionCache()
+        maze = Maze(6, 6)
+
+        assert cache.solve(maze, AStarSolver) == []
+        assert cache.get(maze) == []
+        assert cache.hits == 1
+
+    def test_evicts_least_recently_used_entry(self, kruskal_maze_16: Maze):
+        cache = SolutionCache(max_entries=2)
+        mazes = [copy_maze(kruskal_maze_16, exit_index=exit_index) for exit_index in (-1, -2, -3)]
+
+        cache.solve(mazes[0], AStarSolver)
+        cache.solve(mazes[1], AStarSolver)
+        cache.get(mazes[0])
+        cache.solve(mazes[2], AStarSolver)
+
+        assert len(cache) == 2
+        assert mazes[0] in cache
+        assert mazes[1] not in cache
+
+    def test_bounded_by_bytes(self, recursive_backtracker_maze_16: Maze):
+        mazes = [copy_maze(recursive_backtracker_maze_16, exit_index=exit_index) for exit_index in (-1, -2, -3, -4)]
+        entry_size = len(SolutionCache.encode_path(mazes[0], AStarSolver(mazes[0]).solve_maze()))
+        cache = SolutionCache(max_bytes=entry_size * 2)
+
+        for maze in mazes: cache.solve(maze, AStarSolver)
+
+        assert cache.current_bytes <= entry_size * 2
+        assert cache.current_bytes == sum(len(data) for data in cache.entries.values())
+        assert mazes[-1] in cache
+
+    def test_spills_evicted_entries_to_disk(self, tmp_path, kruskal_maze_16: Maze):
+        spill_directory = os.path.join(tmp_path, "spill")
+        cache = SolutionCache(max_entries=1, spill_directory=spill_directory)
+        first_maze = copy_maze(kruskal_maze_16)
+        second_maze = copy_maze(kruskal_maze_16, exit_index=-2)
+
+        solution = cache.solve(first_maze, AStarSolver)
+        second_solution = cache.solve(second_maze, AStarSolver)
+        assert len(os.listdir(spill_directory)) == 1
+
+        assert cache.get(first_maze) == solution
+        assert cache.hits == 1
+        assert cache.spill_hits == 1
+
+        # Reading first_maze's entry back evicted second_maze's, so both are on disk for other caches to use.
+        other_cache = SolutionCache(spill_directory=spill_directory)
+        assert other_cache.get(first_maze) == solution
+        assert other_cache.get(second_maze) == second_solution
+        assert other_cache.get(copy_maze(kruskal_maze_16, exit_index=-3)) is None
+
+    @pytest.mark.parametrize("max_entries, max_bytes", [[0, 100], [10, 0]])
+    def test_invalid_bounds(self, max_entries: int, max_bytes: int):
+        with pytest.raises(ValueError):
+            SolutionCache(max_entries, max_bytes)
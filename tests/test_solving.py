@@ -1,8 +1,16 @@
+import random
+
 import pytest
 
-from aamaze.base_maze import Maze, SolvingAlgorithm
+import aamaze.base_maze
+import aamaze.solving.dead_end_fill
+
+from aamaze.base_maze import (BOTTOM_WALL, RIGHT_WALL, TOP_WALL, Maze,
+                              SolvingAlgorithm)
 from aamaze.generation import Kruskals, RecursiveBacktracker
-from aamaze.solving import AStarSolver, DijkstraSolver, FloodFillSolutionCheck
+from aamaze.solving import (AStarSolver, BidirectionalSolver,
+                            DeadEndFillSolver, DijkstraSolver,
+                            FloodFillSolutionCheck, LPAStarSolver)
 
 
 @pytest.fixture(scope="module")
@@ -53,6 +61,9 @@ def kruskals_no_outer_exits_16():
 
 solving_algorithms = [AStarSolver,
                        DijkstraSolver,
+                       BidirectionalSolver,
+                       DeadEndFillSolver,
+                       LPAStarSolver,
                        FloodFillSolutionCheck
                        ]
 
@@ -127,3 +138,326 @@ class TestFloodFill:
 
     def test_flood_fill_percentage_equals_1_recursive_backtracker(self, recursive_backtracker_32_flood_filled: FloodFillSolutionCheck):
         assert recursive_backtracker_32_flood_filled.fill_percent == 1
+
+    def test_partial_fill(self):
+        maze = Maze(4, 4, start_filled=False)
+        for index in range(8, 12): maze.build(index, BOTTOM_WALL)
+        flood_fill = FloodFillSolutionCheck(maze)
+        flood_fill.solve_maze()
+
+        assert not flood_fill.solved
+        assert flood_fill.fill_percent == 0.5
+
+    def test_reset_after_solving(self, kruskal_maze_8: Maze):
+        flood_fill = FloodFillSolutionCheck(kruskal_maze_8)
+        flood_fill.solve_maze()
+        flood_fill.setup_data_structures()
+
+        assert not flood_fill.solved
+        assert len(flood_fill.get_incomplete_solution_nodes()) == 1
+
+    def test_label_components_connected_maze(self, kruskal_maze_32: Maze):
+        flood_fill = FloodFillSolutionCheck(kruskal_maze_32)
+
+        assert flood_fill.label_components() == [kruskal_maze_32.size]
+        assert set(flood_fill.component_labels) == {0}
+
+    def test_label_components_split_maze(self):
+        maze = Maze(5, 4, start_filled=False)
+        for index in range(5, 10): maze.build(index, TOP_WALL)
+        maze.build(0, RIGHT_WALL)
+        maze.build(0, TOP_WALL)
+        flood_fill = FloodFillSolutionCheck(maze)
+
+        assert flood_fill.label_components() == [1, 9, 10]
+        assert flood_fill.component_labels[0] == 0
+        assert flood_fill.component_labels[19] == 2
+
+    def test_label_components_filled_maze(self):
+        flood_fill = FloodFillSolutionCheck(Maze(3, 3))
+        assert flood_fill.label_components() == [1] * 9
+
+
+
+class TestAStar:
+    def test_shortest_path_in_open_maze(self):
+        maze = Maze(10, 7, start_filled=False)
+        solver = AStarSolver(maze)
+        solver.solve_maze()
+
+        assert solver.solved
+        assert len(solver.solution) == 16
+        assert solver.solution[0] == maze.entrance_node
+        assert solver.solution[-1] == maze.exit_node
+
+    def test_unsolvable_maze(self):
+        solver = AStarSolver(Maze(6, 6))
+        solver.solve_maze()
+
+        assert not solver.solved
+        assert solver.solution == []
+        assert len(solver.get_incomplete_solution_nodes()) == 1
+
+    def test_reset_after_solving(self, kruskal_maze_8: Maze):
+        solver = AStarSolver(kruskal_maze_8)
+        solution = solver.solve_maze()
+        solver.setup_data_structures()
+
+        assert not solver.solved
+        assert solver.step_counter == 0
+        assert solver.solve_maze() == solution
+
+
+class TestDijkstra:
+    def test_shortest_path_in_open_maze(self):
+        maze = Maze(10, 7, start_filled=False)
+        solver = DijkstraSolver(maze)
+        solver.solve_maze()
+
+        assert solver.solved
+        assert len(solver.solution) == 16
+        assert solver.distances[solver.target_node_index] == 15
+
+    def test_solution_matches_a_star(self, kruskal_maze_32: Maze):
+        dijkstra_solver = DijkstraSolver(kruskal_maze_32)
+        a_star_solver = AStarSolver(kruskal_maze_32)
+
+        assert dijkstra_solver.solve_maze() == a_star_solver.solve_maze()
+
+    def test_unsolvable_maze(self):
+        solver = DijkstraSolver(Maze(6, 6))
+        solver.solve_maze()
+
+        assert not solver.solved
+        assert solver.solution == []
+        assert len(solver.get_incomplete_solution_nodes()) == 1
+
+
+class TestBidirectional:
+    def test_shortest_path_in_open_maze(self):
+        maze = Maze(10, 7, start_filled=False)
+        solver = BidirectionalSolver(maze)
+        solver.solve_maze()
+
+        assert solver.solved
+        assert len(solver.solution) == 16
+        assert solver.solution[0] == maze.entrance_node
+        assert solver.solution[-1] == maze.exit_node
+
+    @pytest.mark.parametrize("maze_size", [5, 9, 16])
+    def test_solution_length_matches_dijkstra_in_open_maze(self, maze_size: int):
+        maze = Maze(maze_size, maze_size + 3, start_filled=False, entrance_index=maze_size + 1, exit_index=-3)
+
+        bidirectional_solution = BidirectionalSolver(maze).solve_maze()
+        dijkstra_solution = DijkstraSolver(maze).solve_maze()
+
+        assert len(bidirectional_solution) == len(dijkstra_solution)
+        for node, next_node in zip(bidirectional_solution, bidirectional_solution[1:]):
+            assert maze.get_direction(maze.get_node_index(node), maze.get_node_index(next_node)) != 0
+
+    def test_solution_matches_a_star(self, kruskal_maze_32: Maze):
+        bidirectional_solver = BidirectionalSolver(kruskal_maze_32)
+        a_star_solver = AStarSolver(kruskal_maze_32)
+
+        assert bidirectional_solver.solve_maze() == a_star_solver.solve_maze()
+
+    def test_expands_from_both_ends(self, recursive_backtracker_maze_32: Maze):
+        solver = BidirectionalSolver(recursive_backtracker_maze_32)
+        for _ in range(20): solver.step()
+
+        expanded_nodes = solver.get_incomplete_solution_nodes()
+        assert recursive_backtracker_maze_32.entrance_node in expanded_nodes
+        assert recursive_backtracker_maze_32.exit_node in expanded_nodes
+
+    def test_entrance_is_exit(self):
+        maze = Maze(4, 4, entrance_index=5, exit_index=5)
+        solver = BidirectionalSolver(maze)
+        solver.solve_maze()
+
+        assert solver.solved
+        assert solver.solution == [maze[5]]
+
+    def test_unsolvable_maze(self):
+        solver = BidirectionalSolver(Maze(6, 6))
+        solver.solve_maze()
+
+        assert not solver.solved
+        assert solver.solution == []
+        assert len(solver.get_incomplete_solution_nodes()) == 1
+
+    def test_reset_after_solving(self, kruskal_maze_8: Maze):
+        solver = BidirectionalSolver(kruskal_maze_8)
+        solution = solver.solve_maze()
+        solver.setup_data_structures()
+
+        assert not solver.solved
+        assert solver.step_counter == 0
+        assert solver.solve_maze() == solution
+
+
+class TestDeadEndFill:
+    def test_solution_matches_a_star(self, kruskal_maze_32: Maze):
+        dead_end_fill_solver = DeadEndFillSolver(kruskal_maze_32)
+        a_star_solver = AStarSolver(kruskal_maze_32)
+
+        assert dead_end_fill_solver.solve_maze() == a_star_solver.solve_maze()
+
+    def test_only_solution_left_unfilled_in_perfect_maze(self, recursive_backtracker_maze_32: Maze):
+        solver = DeadEndFillSolver(recursive_backtracker_maze_32)
+        solver.solve_maze()
+
+        assert len(solver.filled_nodes) + len(solver.solution) == recursive_backtracker_maze_32.size
+        assert not any(solver.filled_status[recursive_backtracker_maze_32.get_node_index(node)]
+                       for node in solver.solution)
+
+    def test_entrance_and_exit_never_filled(self):
+        maze = Maze(8, 8, entrance_index=0, exit_index=1)
+        Kruskals(maze).generate_maze()
+        solver = DeadEndFillSolver(maze)
+        solver.solve_maze()
+
+        assert not solver.filled_status[solver.start_node_index]
+        assert not solver.filled_status[solver.target_node_index]
+
+    def test_each_step_fills_one_node(self, kruskal_maze_8: Maze):
+        solver = DeadEndFillSolver(kruskal_maze_8)
+        for step in range(1, 6):
+            solver.step()
+            assert len(solver.get_incomplete_solution_nodes()) == step
+
+    def test_shortest_path_in_open_maze(self):
+        maze = Maze(10, 7, start_filled=False)
+        solver = DeadEndFillSolver(maze)
+        solver.solve_maze()
+
+        assert solver.solved
+        assert len(solver.filled_nodes) == 0
+        assert len(solver.solution) == 16
+
+    def test_unsolvable_maze(self):
+        solver = DeadEndFillSolver(Maze(6, 6))
+        solver.solve_maze()
+
+        assert not solver.solved
+        assert solver.solution == []
+        assert len(solver.filled_nodes) == 34
+
+    # Pass sizes for every pass vectorised, the default, and stepping from the start.
+    @pytest.mark.parametrize("min_pass_size", [1, aamaze.solving.dead_end_fill.MIN_VECTORISED_PASS_SIZE, 2 ** 31])
+    @pytest.mark.parametrize("maze_fixture", ["kruskal_maze_32", "recursive_backtracker_maze_32",
+                                              "kruskals_no_outer_exits_16"])
+    def test_vectorised_matches_stepping(self, request, monkeypatch, maze_fixture: str, min_pass_size: int):
+        pytest.importorskip("numpy")
+        monkeypatch.setattr(aamaze.solving.dead_end_fill, "MIN_VECTORISED_PASS_SIZE", min_pass_size)
+        maze: Maze = request.getfixturevalue(maze_fixture)
+
+        stepped_solver = DeadEndFillSolver(maze)
+        stepped_solver.solve_maze()
+        vectorised_solver = DeadEndFillSolver(maze)
+        vectorised_solver.solve_maze_vectorised()
+
+        assert vectorised_solver.solved
+        assert vectorised_solver.solution == stepped_solver.solution
+        assert vectorised_solver.filled_status == stepped_solver.filled_status
+        assert sorted(vectorised_solver.filled_nodes) == sorted(stepped_solver.filled_nodes)
+
+    def test_stepping_state_set_up_lazily(self, kruskal_maze_8: Maze):
+        solver = DeadEndFillSolver(kruskal_maze_8)
+        assert solver.pruning_queue is None
+
+        solver.step()
+        assert solver.pruning_queue is not None
+
+    def test_pruning_queue_same_without_numpy(self, monkeypatch, kruskal_maze_32: Maze):
+        pytest.importorskip("numpy")
+        numpy_solver = DeadEndFillSolver(kruskal_maze_32)
+        numpy_solver.setup_pruning_queue()
+
+        monkeypatch.setattr(aamaze.solving.dead_end_fill, "np", None)
+        python_solver = DeadEndFillSolver(kruskal_maze_32)
+        python_solver.setup_pruning_queue()
+
+        assert python_solver.degrees == numpy_solver.degrees
+        assert python_solver.pruning_queue == numpy_solver.pruning_queue
+        assert python_solver.solve_maze() == numpy_solver.solve_maze()
+
+    def test_vectorised_requires_numpy(self, monkeypatch, kruskal_maze_8: Maze):
+        monkeypatch.setattr(aamaze.base_maze, "np", None)
+        with pytest.raises(ImportError):
+            DeadEndFillSolver(kruskal_maze_8).solve_maze_vectorised()
+
+
+class TestLPAStar:
+    def test_solution_matches_a_star(self, kruskal_maze_32: Maze):
+        lpa_star_solver = LPAStarSolver(kruskal_maze_32)
+        a_star_solver = AStarSolver(kruskal_maze_32)
+
+        assert len(lpa_star_solver.solve_maze()) == len(a_star_solver.solve_maze())
+        lpa_star_solver.detach()
+
+    def test_matches_a_star_after_wall_changes(self):
+        maze = Maze(20, 20)
+        Kruskals(maze).generate_maze()
+        solver = LPAStarSolver(maze)
+        solver.solve_maze()
+
+        rng = random.Random(7)
+        for _ in range(60):
+            index = rng.randrange(maze.size - maze.w - 1)
+            direction = rng.choice([TOP_WALL, RIGHT_WALL])
+            if maze.is_open(index, direction): maze.build(index, direction)
+            else: maze.carve(index, direction)
+
+            solution = solver.solve_maze()
+            a_star_solver = AStarSolver(maze)
+            a_star_solver.solve_maze()
+
+            assert solver.solved == a_star_solver.solved
+            assert len(solution) == len(a_star_solver.solution)
+            for node, next_node in zip(solution, solution[1:]):
+                assert maze.get_direction(maze.get_node_index(node), maze.get_node_index(next_node)) != 0
+
+    def test_wall_change_marks_unsolved(self, kruskal_maze_8: Maze):
+        maze = Maze(8, 8, wall_grid=bytearray(kruskal_maze_8.wall_grid))
+        solver = LPAStarSolver(maze)
+        solver.solve_maze()
+
+        maze.carve(20, TOP_WALL)
+        assert not solver.solved
+        assert solver.solution == []
+
+    def test_only_affected_nodes_expanded_after_change(self, recursive_backtracker_maze_32: Maze):
+        maze = Maze(32, 32, wall_grid=bytearray(recursive_backtracker_maze_32.wall_grid))
+        solver = LPAStarSolver(maze)
+        solver.solve_maze()
+        initial_expanded_nodes = len(solver.expanded_nodes)
+
+        # Closing and opening a wall next to the exit only changes distances near the exit.
+        exit_index = solver.target_node_index
+        neighbour_index = next(maze.open_neighbours(exit_index))
+        open_direction = maze.get_direction(exit_index, neighbour_index)
+
+        maze.build(exit_index, open_direction)
+        maze.carve(exit_index, open_direction)
+        solution = solver.solve_maze()
+
+        assert solver.solved
+        assert len(solution) == len(AStarSolver(maze).solve_maze())
+        assert len(solver.expanded_nodes) < initial_expanded_nodes
+
+    def test_detach_stops_updates(self, kruskal_maze_8: Maze):
+        maze = Maze(8, 8, wall_grid=bytearray(kruskal_maze_8.wall_grid))
+        solver = LPAStarSolver(maze)
+        solver.solve_maze()
+        solver.detach()
+
+        maze.carve(20, TOP_WALL)
+        assert solver.solved
+
+    def test_unsolvable_maze(self):
+        solver = LPAStarSolver(Maze(6, 6))
+        solver.solve_maze()
+
+        assert not solver.solved
+        assert solver.solution == []
+        assert len(solver.get_incomplete_solution_nodes()) == 1